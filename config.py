@@ -46,6 +46,18 @@ class Config:
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     PINECONE_APIKEY = os.getenv('PINECONE_API_KEY')
     PINECONE_INDEX = os.getenv('PINECONE_INDEX')
+    # RAG chunk embedding batches (src/services/rag_services/embedding_pipeline.py)
+    RAG_EMBEDDING_BATCH_SIZE = os.getenv('RAG_EMBEDDING_BATCH_SIZE', 100)
+    RAG_EMBEDDING_BATCH_TOKENS = os.getenv('RAG_EMBEDDING_BATCH_TOKENS', 100000)
+    RAG_EMBEDDING_CONCURRENCY = os.getenv('RAG_EMBEDDING_CONCURRENCY', 4)
+    # RAG vector store batches (src/services/rag_services/vector_store.py)
+    RAG_VECTOR_UPSERT_BATCH_SIZE = os.getenv('RAG_VECTOR_UPSERT_BATCH_SIZE', 100)
+    RAG_VECTOR_DELETE_BATCH_SIZE = os.getenv('RAG_VECTOR_DELETE_BATCH_SIZE', 1000)
+    RAG_VECTOR_STORE_CONCURRENCY = os.getenv('RAG_VECTOR_STORE_CONCURRENCY', 4)
+    # RAG document parsing pool (src/services/utils/rag_utils.py)
+    RAG_PARSER_WORKERS = os.getenv('RAG_PARSER_WORKERS', 2)
+    RAG_MAX_FILE_BYTES = os.getenv('RAG_MAX_FILE_BYTES', 52428800)
+    RAG_PARSE_TIMEOUT = os.getenv('RAG_PARSE_TIMEOUT', 120)
     TRIGGER_PROJECT_ID = os.getenv('TRIGGER_PROJECT_ID', '')
     CHATBOT_ACCESS_KEY = os.getenv('Chatbot_Access_key')
     PUBLIC_CHATBOT_TOKEN = os.getenv('public_chatbot_token')
@@ -59,4 +71,68 @@ class Config:
     OPENAI_API_KEY_GPT_5_NANO = os.getenv('OPENAI_API_KEY_GPT_5_NANO')
     HIPPOCAMPUS_API_KEY = os.getenv('HIPPOCAMPUS_API_KEY')
     HIPPOCAMPUS_COLLECTION_ID = os.getenv('HIPPOCAMPUS_COLLECTION_ID')
-    FIRECRAWL_API_KEY = os.getenv('FIRECRAWL_API_KEY')
\ No newline at end of file
+    FIRECRAWL_API_KEY = os.getenv('FIRECRAWL_API_KEY')
+    # Shared outbound HTTP pool (src/services/utils/apiservice.py)
+    HTTP_POOL_LIMIT = os.getenv('HTTP_POOL_LIMIT', 200)
+    HTTP_POOL_LIMIT_PER_HOST = os.getenv('HTTP_POOL_LIMIT_PER_HOST', 50)
+    HTTP_KEEPALIVE_TIMEOUT = os.getenv('HTTP_KEEPALIVE_TIMEOUT', 30)
+    HTTP_DNS_CACHE_TTL = os.getenv('HTTP_DNS_CACHE_TTL', 300)
+    HTTP_CONNECT_TIMEOUT = os.getenv('HTTP_CONNECT_TIMEOUT', 10)
+    HTTP_TOTAL_TIMEOUT = os.getenv('HTTP_TOTAL_TIMEOUT', 300)
+    # Media fetch cache (src/services/utils/apiservice.py)
+    MEDIA_CACHE_MAX_BYTES = os.getenv('MEDIA_CACHE_MAX_BYTES', 134217728)
+    MEDIA_CACHE_MAX_ITEM_BYTES = os.getenv('MEDIA_CACHE_MAX_ITEM_BYTES', 20971520)
+    MEDIA_CACHE_REVALIDATE_SECONDS = os.getenv('MEDIA_CACHE_REVALIDATE_SECONDS', 300)
+    # Per-process provider SDK client pool (src/services/commonServices/sdk_client_pool.py)
+    SDK_CLIENT_POOL_SIZE = os.getenv('SDK_CLIENT_POOL_SIZE', 256)
+    SDK_CLIENT_IDLE_TTL = os.getenv('SDK_CLIENT_IDLE_TTL', 900)
+    # Seconds an evicted client stays open for requests still using it (the SDKs' default request timeout)
+    SDK_CLIENT_CLOSE_GRACE = os.getenv('SDK_CLIENT_CLOSE_GRACE', 600)
+    # Set to "true" to run Anthropic calls on a worker-thread event loop instead of the main loop
+    ANTHROPIC_THREAD_EXECUTOR = os.getenv('ANTHROPIC_THREAD_EXECUTOR')
+    # In-process L1 cache in front of Redis (src/services/cache_service.py)
+    LOCAL_CACHE_MAXSIZE = os.getenv('LOCAL_CACHE_MAXSIZE', 1000)
+    # Seconds; kept short because the admin backend edits bridge configs without publishing invalidations
+    LOCAL_CACHE_TTL = os.getenv('LOCAL_CACHE_TTL', 5)
+    # Redis value codec (src/services/cache_codec.py): "orjson" or "json"; compression threshold in bytes, 0 disables
+    CACHE_CODEC = os.getenv('CACHE_CODEC', 'orjson')
+    CACHE_COMPRESSION_THRESHOLD = os.getenv('CACHE_COMPRESSION_THRESHOLD', 0)
+    CACHE_COMPRESSION_LEVEL = os.getenv('CACHE_COMPRESSION_LEVEL', 6)
+    # Serve the previous bridge config while a reload is in flight (src/db_services/ConfigurationServices.py)
+    CONFIG_STALE_WHILE_REVALIDATE = os.getenv('CONFIG_STALE_WHILE_REVALIDATE')
+    CONFIG_STALE_TTL = os.getenv('CONFIG_STALE_TTL', 300)
+    # Batched conversation log writer (src/db_services/batch_writer.py)
+    CONVERSATION_LOG_BATCH_SIZE = os.getenv('CONVERSATION_LOG_BATCH_SIZE', 100)
+    CONVERSATION_LOG_FLUSH_INTERVAL = os.getenv('CONVERSATION_LOG_FLUSH_INTERVAL', 1)
+    CONVERSATION_LOG_MAX_PENDING = os.getenv('CONVERSATION_LOG_MAX_PENDING', 10000)
+    # Seconds shutdown waits for each batched writer to drain before dropping what is left
+    BATCH_WRITER_DRAIN_TIMEOUT = os.getenv('BATCH_WRITER_DRAIN_TIMEOUT', 10)
+    # Batched Timescale metrics writer (src/db_services/batch_writer.py)
+    METRICS_BATCH_SIZE = os.getenv('METRICS_BATCH_SIZE', 500)
+    METRICS_FLUSH_INTERVAL = os.getenv('METRICS_FLUSH_INTERVAL', 2)
+    METRICS_MAX_PENDING = os.getenv('METRICS_MAX_PENDING', 20000)
+    # Seconds between pushes of per-worker /metrics observations to Redis (src/services/utils/prometheus_metrics.py)
+    PROMETHEUS_FLUSH_INTERVAL = os.getenv('PROMETHEUS_FLUSH_INTERVAL', 5)
+    # Per-(service, model) provider circuit breaker (src/services/commonServices/circuit_breaker.py)
+    CIRCUIT_BREAKER_ENABLED = os.getenv('CIRCUIT_BREAKER_ENABLED', 'true')
+    CIRCUIT_BREAKER_WINDOW = os.getenv('CIRCUIT_BREAKER_WINDOW', 60)
+    CIRCUIT_BREAKER_MIN_REQUESTS = os.getenv('CIRCUIT_BREAKER_MIN_REQUESTS', 20)
+    CIRCUIT_BREAKER_ERROR_RATE = os.getenv('CIRCUIT_BREAKER_ERROR_RATE', 0.5)
+    CIRCUIT_BREAKER_SLOW_CALL_SECONDS = os.getenv('CIRCUIT_BREAKER_SLOW_CALL_SECONDS', 0)
+    CIRCUIT_BREAKER_SLOW_CALL_RATE = os.getenv('CIRCUIT_BREAKER_SLOW_CALL_RATE', 0.8)
+    CIRCUIT_BREAKER_OPEN_SECONDS = os.getenv('CIRCUIT_BREAKER_OPEN_SECONDS', 30)
+    CIRCUIT_BREAKER_HALF_OPEN_PROBES = os.getenv('CIRCUIT_BREAKER_HALF_OPEN_PROBES', 1)
+    # Hedged primary/fall_back requests (src/services/commonServices/hedging.py)
+    HEDGE_DEFAULT_DELAY = os.getenv('HEDGE_DEFAULT_DELAY', 5)
+    HEDGE_MIN_SAMPLES = os.getenv('HEDGE_MIN_SAMPLES', 20)
+    HEDGE_LATENCY_SAMPLES = os.getenv('HEDGE_LATENCY_SAMPLES', 200)
+    # Exact-match provider response cache (src/services/commonServices/response_cache.py)
+    RESPONSE_CACHE_TTL = os.getenv('RESPONSE_CACHE_TTL', 3600)
+    # Semantic response cache (src/services/commonServices/semantic_cache.py)
+    SEMANTIC_CACHE_MAX_ENTRIES = os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', 5000)
+    SEMANTIC_CACHE_EMBEDDING_MODEL = os.getenv('SEMANTIC_CACHE_EMBEDDING_MODEL', 'text-embedding-3-small')
+    SEMANTIC_CACHE_EMBEDDING_DIMENSIONS = os.getenv('SEMANTIC_CACHE_EMBEDDING_DIMENSIONS', 256)
+    # Guardrails verdict cache (src/services/utils/guardrails_validator.py)
+    GUARDRAILS_VERDICT_TTL = os.getenv('GUARDRAILS_VERDICT_TTL', 86400)
+    # Compiled tool schema cache (src/services/commonServices/baseService/utils.py)
+    TOOL_SCHEMA_CACHE_SIZE = os.getenv('TOOL_SCHEMA_CACHE_SIZE', 1000)
@@ -1,6 +1,6 @@
 import src.routes.rag_routes
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -17,6 +17,12 @@ from src.routes.rag_routes import router as rag_routes
 from src.routes.image_process_routes import router as image_process_routes
 from models.Timescale.connections import init_async_dbservice
 from src.configs.model_configuration import init_model_configuration, background_listen_for_changes
+from src.services.utils.apiservice import close_http_session
+from src.services.utils.rag_utils import shutdown_parser_pool
+from src.services.commonServices.sdk_client_pool import close_sdk_clients
+from src.services.cache_service import listen_for_local_cache_invalidations
+from src.db_services.batch_writer import start_batch_writers, stop_batch_writers
+from src.services.utils.prometheus_metrics import export_metrics_periodically, render_metrics
 from globals import *
 
 # Initialize Atatus only when properly configured in PRODUCTION
@@ -69,9 +75,12 @@ async def lifespan(app: FastAPI):
     asyncio.create_task(init_async_dbservice()) if Config.ENVIROMENT == 'LOCAL' else await init_async_dbservice()
     
     asyncio.create_task(repeat_function())
+    start_batch_writers()
 
     logger.info("Starting MongoDB change stream listener as a background task.")
     change_stream_task = asyncio.create_task(background_listen_for_changes())
+    local_cache_invalidation_task = asyncio.create_task(listen_for_local_cache_invalidations())
+    metrics_export_task = asyncio.create_task(export_metrics_periodically())
     
     yield  # Startup logic is complete
     
@@ -80,6 +89,8 @@ async def lifespan(app: FastAPI):
     
     logger.info("Shutting down MongoDB change stream listener.")
     change_stream_task.cancel()
+    local_cache_invalidation_task.cancel()
+    metrics_export_task.cancel()
 
     if consume_task:
         consume_task.cancel()
@@ -88,6 +99,10 @@ async def lifespan(app: FastAPI):
 
     await queue_obj.disconnect()
     await sub_queue_obj.disconnect()
+    await stop_batch_writers()
+    await close_http_session()
+    await close_sdk_clients()
+    shutdown_parser_pool()
 
     try:
         if consume_task:
@@ -125,6 +140,11 @@ async def healthcheck():
             "status": "OK running good... v1.2",
     })
 
+# Prometheus scrape endpoint; values are aggregated across all workers
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(await render_metrics(), media_type="text/plain; version=0.0.4")
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(exc: RequestValidationError):
     return JSONResponse(
@@ -1,5 +1,6 @@
 import os
 import sqlalchemy as sa
+import sqlalchemy.ext.asyncio as sa_async
 from sqlalchemy.orm import declarative_base, sessionmaker
 import importlib.util
 import sys
@@ -18,6 +19,11 @@ DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}"
 engine = sa.create_engine(DATABASE_URL, pool_pre_ping=True)
 Session = sessionmaker(bind=engine, autoflush=False)
 
+# Async engine for code running on the event loop
+ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+async_engine = sa_async.create_async_engine(ASYNC_DATABASE_URL, pool_pre_ping=True)
+AsyncSession = sa_async.async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 retry_strategy = {
     'max_retries': 100,
     'pool_recycle': 300,
@@ -55,6 +61,8 @@ for model_name in db:
 
 db['engine'] = engine
 db['session'] = Session
+db['async_engine'] = async_engine
+db['async_session'] = AsyncSession
 
 metadata = sa.MetaData()
 
@@ -50,7 +50,10 @@ redis_keys = {
     'bridgeusedcost_' : 'bridgeusedcost_',
     'folderusedcost_' : 'folderusedcost_',
     'apikeyusedcost_' : 'apikeyusedcost_',
-    'last_transffered_agent_' : 'last_transffered_agent_'
+    'last_transffered_agent_' : 'last_transffered_agent_',
+    'response_cache_' : 'response_cache_',
+    'semantic_cache_' : 'semantic_cache_',
+    'guardrails_verdict_' : 'guardrails_verdict_'
 }
 
 limit_types={
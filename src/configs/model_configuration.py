@@ -1,34 +1,109 @@
 import asyncio
 import time
+from collections.abc import Mapping
+from types import MappingProxyType
 from pymongo.errors import OperationFailure, PyMongoError
-from src.services.utils.load_model_configs import get_model_configurations
+from src.services.utils.load_model_configs import get_model_configuration_documents, format_model_configuration
 from models.mongo_connection import db
 from src.services.utils.logger import logger
 from globals import *
 
 model_config_model = db["modelconfigurations"]
-model_config_document = {}
+
+
+class ModelConfigStore(Mapping):
+    """
+    Read-only view of the current model configuration snapshot ({service: {model: config}}).
+
+    Modules import this object once; updates never mutate a published snapshot but
+    build a new one and swap the reference, so readers always see a complete config.
+    """
+    def __init__(self):
+        self._snapshot = MappingProxyType({})
+
+    def __getitem__(self, service):
+        return self._snapshot[service]
+
+    def __iter__(self):
+        return iter(self._snapshot)
+
+    def __len__(self):
+        return len(self._snapshot)
+
+    def snapshot(self):
+        return self._snapshot
+
+    def publish(self, services):
+        self._snapshot = MappingProxyType({
+            service: models if isinstance(models, MappingProxyType) else MappingProxyType(models)
+            for service, models in services.items()
+        })
+
+
+model_config_document = ModelConfigStore()
+# Mongo _id of every loaded document -> (service, model_name), needed to apply deletes
+model_config_ids = {}
 
 async def init_model_configuration():
     """Initializes or refreshes the model configuration document."""
-    global model_config_document
+    global model_config_ids
     try:
-        new_document = await get_model_configurations()
-        model_config_document.clear() # Clear old config before updating
-        model_config_document.update(new_document)
+        documents = await get_model_configuration_documents()
+        services, ids = {}, {}
+        for document in documents:
+            conf = format_model_configuration(document)
+            services.setdefault(conf['service'], {})[conf['model_name']] = conf
+            ids[str(document['_id'])] = (conf['service'], conf['model_name'])
+        model_config_document.publish(services)
+        model_config_ids = ids
         logger.info("Model configurations refreshed successfully.")
     except Exception as e:
         logger.error(f"Error refreshing model configurations: {e}")
 
+def apply_model_configuration_change(change):
+    """Apply a single change stream event to the model configuration snapshot."""
+    document_id = str(change['documentKey']['_id'])
+    document = change.get('fullDocument')
+    services = dict(model_config_document.snapshot())
+    touched = {}
+
+    def models_of(service):
+        if service not in touched:
+            touched[service] = dict(services.get(service, {}))
+        return touched[service]
+
+    previous = model_config_ids.pop(document_id, None)
+    if previous:
+        models_of(previous[0]).pop(previous[1], None)
+
+    # fullDocument is None for deletes, or for updates whose document is already gone
+    if change['operationType'] != 'delete' and document:
+        conf = format_model_configuration(document)
+        models_of(conf['service'])[conf['model_name']] = conf
+        model_config_ids[document_id] = (conf['service'], conf['model_name'])
+
+    for service, models in touched.items():
+        if models:
+            services[service] = models
+        else:
+            services.pop(service, None)
+    model_config_document.publish(services)
+
 async def _async_change_listener():
     """The core async change stream listener."""
     pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}}]
     try:
-        async with model_config_model.watch(pipeline) as stream:
+        async with model_config_model.watch(pipeline, full_document='updateLookup') as stream:
             logger.info("MongoDB change stream is now listening for model configuration changes.")
+            # Pick up anything changed while the stream was not open
+            await init_model_configuration()
             async for change in stream:
                 logger.info(f"Change detected in model configurations: {change['operationType']}")
-                await init_model_configuration()
+                try:
+                    apply_model_configuration_change(change)
+                except Exception as e:
+                    logger.error(f"Failed to apply model configuration change, reloading all: {e}")
+                    await init_model_configuration()
     except OperationFailure as e:
         logger.error(f"Change stream operation failed: {e}")
         raise # Re-raise to be caught by the sync wrapper
@@ -47,4 +122,3 @@ async def background_listen_for_changes():
         except Exception as e:
             logger.error(f"An unexpected error occurred in background_listen_for_changes: {e}. Restarting in 10 seconds...")
             await asyncio.sleep(10)
-
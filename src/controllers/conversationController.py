@@ -37,7 +37,7 @@ async def savehistory_consolidated(conversation_data):
             - error, firstAttemptError, finish_reason, parent_id, child_id
             
     Returns:
-        Integer ID of created record or None if failed
+        True once the log is queued for the batched database writer
     """
     try:
         # Send data through RT layer with sensitive data removed (first)
@@ -1,7 +1,7 @@
-import requests
 import re
 import time
 from ..services.rag_services.chunking_methords import semantic_chunking, manual_chunking, recursive_chunking
+from ..services.rag_services.vector_store import upsert_chunks, delete_chunks
 from pinecone import Pinecone
 import uuid
 from config import Config
@@ -14,7 +14,7 @@ from fastapi import HTTPException
 from ..services.utils.rag_utils import extract_pdf_text, extract_csv_text, extract_docx_text
 import traceback
 from ..services.utils.rag_utils import get_csv_query_type
-from ..services.utils.apiservice import fetch
+from ..services.utils.apiservice import fetch, fetch_bytes
 
 rag_model = db["rag_datas"]
 rag_parent_model = db["rag_parent_datas"]
@@ -110,18 +110,13 @@ async def get_google_docs_data(url):
         # Construct the Google Docs export URL (export as plain text)
         doc_url = f"https://docs.google.com/document/d/{doc_id}/export?format=txt"
         
-        # Send GET request to fetch the document content
-        response = requests.get(doc_url)
-        
-        # Check if the request was successful
-        if response.status_code == 200:
-            return {
-                "status": "success",
-                "data": response.text,
-                "doc_id": doc_id
-            }
-        else:
-            raise HTTPException(status_code=500, detail=f"Error fetching the document. Status code: {response.status_code}")
+        # Fetch the document content over the shared async HTTP session; non-2xx responses raise
+        content, _ = await fetch_bytes(doc_url)
+        return {
+            "status": "success",
+            "data": content.decode('utf-8'),
+            "doc_id": doc_id
+        }
     except Exception as error:
         print(f"Error in get_google_docs_data: {error}")
         raise HTTPException(status_code=500, detail= error)
@@ -129,26 +124,28 @@ async def get_google_docs_data(url):
 async def store_in_pinecone_and_mongo(embeddings, chunks, org_id, user_id, name, description, doc_id, file_extension):
     try:
         index = pc.Index(pinecone_index)
-        chunks_array = []
         if doc_id is None:
             doc_id = str(uuid.uuid4())
+        vectors = []
+        documents = []
         for embedding, chunk in zip(embeddings, chunks):
             chunk_id = str(uuid.uuid4())
-            # Store in Pinecone
-            vectors = [{
+            vectors.append({
                 "id": chunk_id,
                 "values": embedding[0] if isinstance(embedding, list) and len(embedding) == 1 else list(map(float, embedding)),
                 "metadata": {"org_id": org_id, "doc_id": doc_id}
-            }]
-            index.upsert(vectors=vectors, namespace=org_id)
-            # Store in MongoDB
-            rag_model.insert_one({
+            })
+            documents.append({
                 "chunk": chunk,
                 "chunk_id": chunk_id,
                 "org_id": org_id,
                 "doc_id": doc_id
             })
-            chunks_array.append(chunk_id)
+        # Store in Pinecone and MongoDB in batches
+        stored = await upsert_chunks(index, rag_model, org_id, vectors, documents)
+        chunks_array = stored['stored']
+        if documents and not chunks_array:
+            raise Exception(f"None of the {len(documents)} chunks could be stored: {stored['failed'][0]['error']}")
         result = await rag_parent_model.insert_one({
             "name": name,
             "description": description,
@@ -160,10 +157,11 @@ async def store_in_pinecone_and_mongo(embeddings, chunks, org_id, user_id, name,
         })
         inserted_id = result.inserted_id
         return {
-            "success": True,
-            "message": "Data stored successfully.",
+            "success": not stored['failed'],
+            "message": "Data stored successfully." if not stored['failed'] else f"Data stored with {len(stored['failed'])} of {len(documents)} chunks failed.",
             "doc_id": doc_id,
-            "_id": str(inserted_id)
+            "_id": str(inserted_id),
+            "failed_chunks": stored['failed']
         }
             
     except Exception as error:
@@ -260,9 +258,15 @@ async def delete_doc(request):
         })
         chunks_array = [] if result is None else result.get('chunks_id_array', [])
         
-        for chunk_id in chunks_array:
-            index.delete(ids=[chunk_id], namespace=org_id)
-            rag_model.delete_one({"chunk_id": chunk_id})
+        failed_chunks = await delete_chunks(index, rag_model, org_id, chunks_array)
+        if failed_chunks:
+            # Keep the document pointing at the chunks that are left, so deleting it again retries them
+            await rag_parent_model.update_one({"_id": ObjectId(id)}, {"$set": {"chunks_id_array": failed_chunks}})
+            return JSONResponse(status_code=200, content={
+                "success": False,
+                "message": f"Could not delete {len(failed_chunks)} of {len(chunks_array)} chunks.",
+                "failed_chunks": failed_chunks
+            })
         deleted_doc = await rag_parent_model.find_one_and_delete({"_id": ObjectId(id)})
         if deleted_doc:
             deleted_doc['_id'] = str(deleted_doc['_id'])
@@ -1,6 +1,6 @@
 from models.mongo_connection import db
 from bson import ObjectId
-from ..services.cache_service import find_in_cache, store_in_cache, delete_in_cache, make_json_serializable
+from ..services.cache_service import find_in_cache, find_json_in_cache, find_many_json_in_cache, store_in_cache, delete_in_cache, make_json_serializable
 import json
 from globals import *
 from bson import errors
@@ -9,6 +9,7 @@ from config import Config
 import jwt
 from datetime import datetime
 from ..services.utils.apiservice import fetch
+from ..services.utils.single_flight import SingleFlight
 
 configurationModel = db["configurations"]
 apiCallModel = db['apicalls']
@@ -21,9 +22,8 @@ foldersModel = db['folders']
 async def get_bridges_with_redis(bridge_id = None, org_id = None, version_id = None):
     try:
         cache_key = f"{redis_keys['get_bridge_data_']}{version_id or bridge_id}"
-        cached_data = await find_in_cache(cache_key)
-        if cached_data:
-            cached_result = json.loads(cached_data)
+        cached_result = await find_json_in_cache(cache_key, use_local_cache=True)
+        if cached_result is not None:
             return cached_result[0] if cached_result else {}
         model = version_model if version_id else configurationModel
         id_to_use = ObjectId(version_id) if version_id else ObjectId(bridge_id)
@@ -83,15 +83,36 @@ async def get_bridges_without_tools(bridge_id=None, org_id=None, version_id=None
         logger.error(f'Error in get_bridges_without_tools : {str(error)}')
         raise error
 
+# Concurrent cache misses for the same bridge share one aggregation
+bridge_data_loads = SingleFlight(
+    stale_ttl=int(Config.CONFIG_STALE_TTL) if (Config.CONFIG_STALE_WHILE_REVALIDATE or "").lower() == "true" else 0
+)
+
+async def prefetch_bridge_caches(bridge_id, version_id):
+    """
+    Read a version's cached document and its bridge's with one MGET into the L1
+    tier, so the two lookups of get_bridge_data that follow are served locally.
+    """
+    await find_many_json_in_cache([
+        f"{redis_keys['bridge_data_with_tools_']}{version_id}",
+        f"{redis_keys['get_bridge_data_']}{bridge_id}",
+    ], use_local_cache=True)
+
 async def get_bridges_with_tools_and_apikeys(bridge_id, org_id, version_id=None):
-    try:
-        cache_key = f"{redis_keys['bridge_data_with_tools_']}{version_id or bridge_id}"
-       
-        # Attempt to retrieve data from Redis cache
-        cached_data = await find_in_cache(cache_key)
-        if cached_data:
-            return json.loads(cached_data)
+    cache_key = f"{redis_keys['bridge_data_with_tools_']}{version_id or bridge_id}"
 
+    # Attempt to retrieve data from the in-process cache, then Redis
+    cached_data = await find_json_in_cache(cache_key, use_local_cache=True)
+    if cached_data:
+        return cached_data
+
+    return await bridge_data_loads.run(
+        (cache_key, org_id),
+        lambda: _load_bridges_with_tools_and_apikeys(bridge_id, org_id, version_id, cache_key)
+    )
+
+async def _load_bridges_with_tools_and_apikeys(bridge_id, org_id, version_id, cache_key):
+    try:
         model = version_model if version_id else configurationModel
         id_to_use = ObjectId(version_id) if version_id else ObjectId(bridge_id)
         pipeline = [
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from sqlalchemy import insert
+from config import Config
+from models.index import combined_models as models
+from models.postgres.pg_models import ConversationLog
+from models.Timescale.timescale_models import Metrics_model
+from globals import *
+
+pg = models['pg']
+timescale = models['timescale']
+
+DRAIN_TIMEOUT = float(Config.BATCH_WRITER_DRAIN_TIMEOUT)
+
+
+class BatchInsertWriter:
+    """
+    Buffers rows for one table and inserts them in batches on an async engine.
+
+    A batch is flushed once it reaches `batch_size` rows or `flush_interval` seconds
+    after its first row, whichever comes first. The buffer is bounded by `max_pending`;
+    when it is full, add() waits for the writer to catch up (back-pressure) instead of
+    growing memory.
+    """
+
+    def __init__(self, model, session_factory, batch_size, flush_interval, max_pending):
+        self.model = model
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = asyncio.Queue(maxsize=max_pending)
+        self.task = None
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def add(self, row: dict):
+        self.start()
+        await self.queue.put(row)
+
+    async def stop(self):
+        """
+        Wait up to DRAIN_TIMEOUT seconds for the buffered rows to be written, then
+        stop the writer. Called on shutdown; rows still buffered after that are lost.
+        """
+        if self.task is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.error(f"Dropping {self.queue.qsize()} unwritten rows for {self.model.__tablename__}: writer did not drain within {DRAIN_TIMEOUT}s")
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+    async def _run(self):
+        while True:
+            rows = [await self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(rows) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    rows.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(rows)
+            finally:
+                for _ in rows:
+                    self.queue.task_done()
+
+    async def _flush(self, rows):
+        if not rows:
+            return
+        try:
+            async with self.session_factory() as session:
+                # executemany needs identical keys, so group rows by their column set
+                groups = {}
+                for row in rows:
+                    groups.setdefault(frozenset(row), []).append(row)
+                for group in groups.values():
+                    await session.execute(insert(self.model), group)
+                await session.commit()
+        except Exception as err:
+            logger.error(f"Error flushing {len(rows)} rows into {self.model.__tablename__}, retrying one by one: {str(err)}")
+            await self._flush_individually(rows)
+
+    async def _flush_individually(self, rows):
+        for row in rows:
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(insert(self.model), [row])
+                    await session.commit()
+            except Exception as err:
+                logger.error(f"Error inserting row into {self.model.__tablename__}: {str(err)}")
+
+
+conversation_log_writer = BatchInsertWriter(
+    ConversationLog,
+    pg['async_session'],
+    batch_size=int(Config.CONVERSATION_LOG_BATCH_SIZE),
+    flush_interval=float(Config.CONVERSATION_LOG_FLUSH_INTERVAL),
+    max_pending=int(Config.CONVERSATION_LOG_MAX_PENDING)
+)
+
+metrics_writer = BatchInsertWriter(
+    Metrics_model,
+    timescale['session'],
+    batch_size=int(Config.METRICS_BATCH_SIZE),
+    flush_interval=float(Config.METRICS_FLUSH_INTERVAL),
+    max_pending=int(Config.METRICS_MAX_PENDING)
+)
+
+def start_batch_writers():
+    conversation_log_writer.start()
+    metrics_writer.start()
+
+async def stop_batch_writers():
+    """Drain every writer; called from the application lifespan on shutdown."""
+    await asyncio.gather(conversation_log_writer.stop(), metrics_writer.stop())
@@ -7,6 +7,7 @@ from ..services.cache_service import find_in_cache, store_in_cache
 from datetime import datetime
 from models.postgres.pg_models import system_prompt_versionings, user_bridge_config_history, ConversationLog, OrchestratorConversationLog
 from models.Timescale.timescale_models import Metrics_model
+from .batch_writer import conversation_log_writer, metrics_writer
 from sqlalchemy.sql import text
 from globals import *
 from datetime import timedelta
@@ -16,26 +17,21 @@ timescale = models['timescale']
 
 async def createConversationLog(conversation_log_data):
     """
-    Create a single consolidated conversation log entry
+    Queue a single consolidated conversation log entry for the batched writer
     
     Args:
         conversation_log_data: Dictionary containing all conversation data
         
     Returns:
-        Integer ID of created record or None if failed
+        True once the row is buffered (rows are inserted asynchronously in batches)
     """
-    session = pg['session']()
-    try:
-        conversation_log = ConversationLog(**conversation_log_data)
-        session.add(conversation_log)
-        session.commit()
-        return conversation_log.id
-    except Exception as err:
-        logger.error(f"Error in creating conversation log: {str(err)}")
-        session.rollback()
-        return None
-    finally:
-        session.close()
+    # Stamp the row now: a func.now() default would record when its batch was flushed.
+    # Local naive time, the same clock as the other rows this service stamps (see storeSystemPrompt)
+    created_at = datetime.now()
+    conversation_log_data.setdefault('created_at', created_at)
+    conversation_log_data.setdefault('updated_at', created_at)
+    await conversation_log_writer.add(conversation_log_data)
+    return True
 
 
 async def createOrchestratorConversationLog(orchestrator_log_data):
@@ -49,18 +45,16 @@ async def createOrchestratorConversationLog(orchestrator_log_data):
     Returns:
         Integer ID of created record or None if failed
     """
-    session = pg['session']()
-    try:
-        orchestrator_log = OrchestratorConversationLog(**orchestrator_log_data)
-        session.add(orchestrator_log)
-        session.commit()
-        return orchestrator_log.id
-    except Exception as err:
-        logger.error(f"Error in creating orchestrator conversation log: {str(err)}")
-        session.rollback()
-        return None
-    finally:
-        session.close()
+    async with pg['async_session']() as session:
+        try:
+            orchestrator_log = OrchestratorConversationLog(**orchestrator_log_data)
+            session.add(orchestrator_log)
+            await session.commit()
+            return orchestrator_log.id
+        except Exception as err:
+            logger.error(f"Error in creating orchestrator conversation log: {str(err)}")
+            await session.rollback()
+            return None
 
 async def find_conversation_logs(org_id, thread_id, sub_thread_id, bridge_id):
     """
@@ -75,11 +69,11 @@ async def find_conversation_logs(org_id, thread_id, sub_thread_id, bridge_id):
     Returns:
         List of conversation logs formatted for response
     """
+    session = pg['async_session']()
     try:
-        session = pg['session']()
-        logs = (
-            session.query(ConversationLog)
-            .filter(
+        query_result = await session.execute(
+            select(ConversationLog)
+            .where(
                 and_(
                     ConversationLog.org_id == org_id,
                     ConversationLog.thread_id == thread_id,
@@ -90,8 +84,8 @@ async def find_conversation_logs(org_id, thread_id, sub_thread_id, bridge_id):
             )
             .order_by(ConversationLog.created_at.desc())
             .limit(3)
-            .all()
         )
+        logs = query_result.scalars().all()
         
         # Convert logs to conversation format expected by the application
         conversations = []
@@ -143,7 +137,7 @@ async def find_conversation_logs(org_id, thread_id, sub_thread_id, bridge_id):
         logger.error(f"Error in finding conversation logs: {str(e)}")
         return []
     finally:
-        session.close()
+        await session.close()
 
 
 async def storeSystemPrompt(prompt, org_id, bridge_id):
@@ -182,14 +176,10 @@ async def add_bulk_user_entries(entries):
 
 
 async def timescale_metrics(metrics_data):
-    async with timescale['session']() as session:
-        try:
-            raws = [Metrics_model(**data) for data in metrics_data]
-            session.add_all(raws)
-            await session.commit()
-        except Exception as e:
-            print("fail in metrics service", e)
-            await session.rollback()
-            raise e
+    """Queue metrics rows; they are written to metrics_raw_data in multi-row batches across requests."""
+    created_at = datetime.now()
+    for data in metrics_data:
+        data.setdefault('created_at', created_at)
+        await metrics_writer.add(data)
 
 
@@ -8,7 +8,7 @@ from models.index import combined_models
 from sqlalchemy import and_
 from ..controllers.conversationController import savehistory_consolidated
 from .conversationDbService import timescale_metrics, createOrchestratorConversationLog
-from ..services.cache_service import find_in_cache, store_in_cache
+from ..services.cache_service import store_in_cache, increment_in_cache
 from globals import *
 # from src.services.utils.send_error_webhook import send_error_to_webhook
 from src.configs.constant import redis_keys
@@ -170,17 +170,11 @@ async def create(dataset, history_params, version_id, thread_info={}):
         
         # Create the cache key based on bridge_id (assuming it's always available)
         cache_key = f"{redis_keys['metrix_bridges_']}{history_params['bridge_id']}"
-        # Safely load the old total token value from the cache
-        cache_value = await find_in_cache(cache_key)
-        try:
-            oldTotalToken = json.loads(cache_value) if cache_value else 0
-        except (json.JSONDecodeError, TypeError):
-            oldTotalToken = 0
-
         # Calculate the total token sum, using .get() for 'totalTokens' to handle missing keys
-        totaltoken = sum(data_object.get('total_tokens', 0) for data_object in dataset) + oldTotalToken
+        totaltoken = sum(data_object.get('total_tokens', 0) or 0 for data_object in dataset)
         # await send_error_to_webhook(history_params['bridge_id'], history_params['org_id'],totaltoken , 'metrix_limit_reached')
-        await store_in_cache(cache_key, float(totaltoken))
+        # INCRBYFLOAT so concurrent requests on the same bridge don't overwrite each other's totals
+        await increment_in_cache(cache_key, totaltoken)
         
         # Only save metrics if there's valid data
         if metrics_data:
@@ -2,6 +2,7 @@ from fastapi import Request, HTTPException
 from src.services.utils.getConfiguration import getConfiguration
 from globals import *
 from src.configs.model_configuration import model_config_document
+from src.services.utils.prometheus_metrics import stage_timer
 
 async def add_configuration_data_to_body(request: Request):
 
@@ -16,23 +17,24 @@ async def add_configuration_data_to_body(request: Request):
         if chatbotData:
             del request.state.chatbot
         version_id = body.get('version_id') or request.path_params.get('version_id')
-        db_config = await getConfiguration(
-            body.get('configuration'), 
-            body.get('service'), 
-            bridge_id, 
-            body.get('apikey'), 
-            body.get('template_id'), 
-            body.get('variables', {}), 
-            org_id, 
-            body.get('variables_path'), 
-            version_id=version_id, 
-            extra_tools=body.get('extra_tools', []), 
-            built_in_tools=body.get('built_in_tools'),
-            guardrails=body.get('guardrails'),
-            web_search_filters=body.get('web_search_filters'),
-            orchestrator_flag = body.get('orchestrator_flag'),
-            chatbot=body.get('chatbot', False)
-        )
+        with stage_timer('config_load'):
+            db_config = await getConfiguration(
+                body.get('configuration'), 
+                body.get('service'), 
+                bridge_id, 
+                body.get('apikey'), 
+                body.get('template_id'), 
+                body.get('variables', {}), 
+                org_id, 
+                body.get('variables_path'), 
+                version_id=version_id, 
+                extra_tools=body.get('extra_tools', []), 
+                built_in_tools=body.get('built_in_tools'),
+                guardrails=body.get('guardrails'),
+                web_search_filters=body.get('web_search_filters'),
+                orchestrator_flag = body.get('orchestrator_flag'),
+                chatbot=body.get('chatbot', False)
+            )
         
         # Check if getConfiguration returned an error response
         if not db_config.get('success', True) or db_config.get('error'):
@@ -1,7 +1,40 @@
-from ..services.cache_service import find_in_cache, store_in_cache, verify_ttl
-import json
+from ..services.cache_service import client, REDIS_PREFIX
+import time
 from fastapi import Request, HTTPException
 from src.configs.constant import redis_keys
+from globals import *
+
+# Sliding-window counter evaluated server-side. For every limit two counters are
+# passed in KEYS (current window, previous window) with ARGV holding
+# (points, window seconds, elapsed ms in the current window). All limits are
+# checked first and only incremented if none is exceeded, so a request costs one
+# round-trip and concurrent requests cannot race past the limit.
+SLIDING_WINDOW_LUA = """
+local blocked = 0
+local retry_after = 0
+for i = 1, #KEYS / 2 do
+    local points = tonumber(ARGV[(i - 1) * 3 + 1])
+    local window_ms = tonumber(ARGV[(i - 1) * 3 + 2]) * 1000
+    local elapsed = tonumber(ARGV[(i - 1) * 3 + 3])
+    local current = tonumber(redis.call('GET', KEYS[(i - 1) * 2 + 1]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[(i - 1) * 2 + 2]) or '0')
+    if previous * (window_ms - elapsed) / window_ms + current >= points then
+        blocked = i
+        retry_after = math.ceil((window_ms - elapsed) / 1000)
+        break
+    end
+end
+if blocked == 0 then
+    for i = 1, #KEYS / 2 do
+        local window_ms = tonumber(ARGV[(i - 1) * 3 + 2]) * 1000
+        redis.call('INCR', KEYS[(i - 1) * 2 + 1])
+        redis.call('PEXPIRE', KEYS[(i - 1) * 2 + 1], window_ms * 2)
+    end
+end
+return {blocked, retry_after}
+"""
+
+sliding_window_script = client.register_script(SLIDING_WINDOW_LUA)
 
 async def get_nested_value(request: Request, path):
     """Extract nested value from the request object based on the key path."""
@@ -31,27 +64,46 @@ async def get_nested_value(request: Request, path):
             return None
     return obj
 
-async def rate_limit(request: Request, key_path: str, points: int = 40, ttl: int = 60):
-    key = await get_nested_value(request, key_path)
-    if not key:
+async def rate_limit_multiple(request: Request, limits: list):
+    """
+    Apply several rate limits in a single atomic Redis call.
+
+    Args:
+        request: Incoming request used to resolve the key paths
+        limits: List of (key_path, points, ttl) tuples; ttl is the window in seconds
+
+    Raises:
+        HTTPException(429) naming the first key whose limit is exceeded
+    """
+    now_ms = int(time.time() * 1000)
+    keys, args, resolved = [], [], []
+    for key_path, points, ttl in limits:
+        key = await get_nested_value(request, key_path)
+        if not key:
+            continue
+        window_ms = int(ttl) * 1000
+        window = now_ms // window_ms
+        base_key = f"{REDIS_PREFIX}{redis_keys['rate_limit_']}{key}"
+        keys += [f"{base_key}_{window}", f"{base_key}_{window - 1}"]
+        args += [int(points), int(ttl), now_ms - window * window_ms]
+        resolved.append(key)
+
+    if not keys:
         return
 
-    redis_key = f"{redis_keys['rate_limit_']}{key}"
-    record = await find_in_cache(redis_key)
-
-    if record:
-        ttl = await verify_ttl(redis_key)
-        data = json.loads(record)
-        count = data['count']
-        if count >= points:
-            raise HTTPException(
-                status_code=429,
-                detail=f"Too many requests for {key}",
-                headers={"Retry-After": str(ttl)}
-            )
-        data['count'] += 1
-    else:
-        data = {'count': 1}
+    try:
+        blocked, retry_after = await sliding_window_script(keys=keys, args=args)
+    except Exception as error:
+        # Fail open: an unavailable Redis must not block traffic
+        logger.error(f"Error applying rate limit: {str(error)}")
+        return
 
-    await store_in_cache(redis_key, data, ttl)
+    if int(blocked):
+        raise HTTPException(
+            status_code=429,
+            detail=f"Too many requests for {resolved[int(blocked) - 1]}",
+            headers={"Retry-After": str(retry_after)}
+        )
 
+async def rate_limit(request: Request, key_path: str, points: int = 40, ttl: int = 60):
+    await rate_limit_multiple(request, [(key_path, points, ttl)])
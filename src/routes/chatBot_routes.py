@@ -1,14 +1,13 @@
 from fastapi import APIRouter, Depends, Request, HTTPException
 from src.middlewares.interfaceMiddlewares import send_data_middleware, chat_bot_auth, reset_chatBot
-from src.middlewares.ratelimitMiddleware import rate_limit
+from src.middlewares.ratelimitMiddleware import rate_limit, rate_limit_multiple
 from src.middlewares.agentsMiddlewares import agents_auth
 
 router = APIRouter()
 
 async def auth_and_rate_limit(request: Request):
     await chat_bot_auth(request)
-    await rate_limit(request,key_path='body.slugName' , points=100)
-    await rate_limit(request,key_path='body.threadId', points=20)
+    await rate_limit_multiple(request, [('body.slugName', 100, 60), ('body.threadId', 20, 60)])
 
 async def public_auth_and_rate_limit(request: Request):
     await agents_auth(request)
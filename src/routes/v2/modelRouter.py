@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi.responses import StreamingResponse
 import asyncio
 
 from src.services.commonServices.common import chat_multiple_agents, embedding, batch, image
 from src.services.commonServices.baseService.utils import make_request_data
+from src.services.commonServices.streaming import stream_chat_response
 from ...middlewares.middleware import jwt_middleware
 from ...middlewares.getDataUsingBridgeId import add_configuration_data_to_body
 from concurrent.futures import ThreadPoolExecutor
 from config import Config
 from src.services.commonServices.queueService.queueService import queue_obj
-from src.middlewares.ratelimitMiddleware import rate_limit
+from src.middlewares.ratelimitMiddleware import rate_limit_multiple
 from globals import *
 
 router = APIRouter()
@@ -17,8 +19,7 @@ executor = ThreadPoolExecutor(max_workers= int(Config.max_workers) or 10)
 
 async def auth_and_rate_limit(request: Request):
     await jwt_middleware(request)
-    await rate_limit(request,key_path='body.bridge_id' , points=100)
-    await rate_limit(request,key_path='body.thread_id', points=20)
+    await rate_limit_multiple(request, [('body.bridge_id', 100, 60), ('body.thread_id', 20, 60)])
 
 @router.post('/chat/completion', dependencies=[Depends(auth_and_rate_limit)])
 async def chat_completion(request: Request, db_config: dict = Depends(add_configuration_data_to_body)):
@@ -44,6 +45,8 @@ async def chat_completion(request: Request, db_config: dict = Depends(add_config
         if type == 'image':
             result = await image(data_to_send)
             return result
+        if data_to_send.get('body', {}).get('stream'):
+            return StreamingResponse(stream_chat_response(chat_multiple_agents, data_to_send), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
         result = await chat_multiple_agents(data_to_send)
         return result
 
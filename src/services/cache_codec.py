@@ -0,0 +1,68 @@
+import json
+import zlib
+import orjson
+from config import Config
+
+# Values written through cache_service are JSON text, optionally zlib-compressed
+# once they cross CACHE_COMPRESSION_THRESHOLD bytes. Compressed values carry a
+# marker prefix that can never start a JSON document, so plain values written
+# by older workers or other services still decode unchanged.
+
+COMPRESSED_MARKER = b'\x00zlib:'
+COMPRESSION_THRESHOLD = int(Config.CACHE_COMPRESSION_THRESHOLD or 0)  # 0 disables compression
+COMPRESSION_LEVEL = int(Config.CACHE_COMPRESSION_LEVEL)
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _default(value):
+    # Same fallbacks make_json_serializable applied: sets become lists and
+    # anything else (ObjectId, datetime, Decimal, ...) is stored as str(value).
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+class JsonCodec:
+    """Standard library codec, kept as a fallback for values orjson rejects."""
+
+    name = 'json'
+
+    def dumps(self, data) -> bytes:
+        return json.dumps(data, default=_default).encode('utf-8')
+
+
+class OrjsonCodec:
+    """orjson encoder; non-native leaves are converted in a single pass through `default`."""
+
+    name = 'orjson'
+
+    def dumps(self, data) -> bytes:
+        try:
+            return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except (TypeError, orjson.JSONEncodeError):
+            # e.g. integers wider than 64 bits
+            return JsonCodec().dumps(data)
+
+
+CODECS = {codec.name: codec for codec in (JsonCodec(), OrjsonCodec())}
+codec = CODECS.get((Config.CACHE_CODEC or 'orjson').lower(), CODECS['orjson'])
+
+
+def encode_value(data) -> bytes:
+    """Serialize data for storage in Redis."""
+    payload = codec.dumps(data)
+    if COMPRESSION_THRESHOLD and len(payload) >= COMPRESSION_THRESHOLD:
+        return COMPRESSED_MARKER + zlib.compress(payload, COMPRESSION_LEVEL)
+    return payload
+
+
+def decode_value(raw):
+    """Turn a raw Redis value back into the JSON text callers of find_in_cache expect."""
+    if raw is None:
+        return None
+    if isinstance(raw, bytes):
+        if raw.startswith(COMPRESSED_MARKER):
+            raw = zlib.decompress(raw[len(COMPRESSED_MARKER):])
+        return raw.decode('utf-8')
+    return raw
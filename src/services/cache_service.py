@@ -1,45 +1,210 @@
 import json
+import asyncio
 from typing import Union, List
+from cachetools import TTLCache
 from config import Config
 from redis.asyncio import Redis
 from fastapi.responses import JSONResponse
 from globals import *
+from .cache_codec import encode_value, decode_value
+from .utils.prometheus_metrics import increment_counter, CACHE_REQUESTS
 
 # Initialize the Redis client
 client = Redis.from_url(Config.REDIS_URI)  # Adjust these parameters as needed
 
 REDIS_PREFIX = 'AIMIDDLEWARE_'
 DEFAULT_REDIS_TTL = 172800  # 2 days
+SCAN_BATCH_SIZE = 500  # keys per SCAN/MGET round-trip for prefix lookups
+
+# In-process L1 tier for hot keys (bridge/version configurations), holding decoded
+# JSON values so a hit skips parsing. Entries are dropped whenever
+# delete_in_cache/clear_cache runs in any worker, via the invalidation channel
+# below. Other services (the admin backend) overwrite and delete these keys without
+# publishing on that channel, so LOCAL_CACHE_TTL is only a few seconds: it absorbs
+# bursts of requests for a hot bridge while keeping config edits visible quickly.
+LOCAL_CACHE_INVALIDATION_CHANNEL = f"{REDIS_PREFIX}local_cache_invalidation"
+local_cache = TTLCache(maxsize=int(Config.LOCAL_CACHE_MAXSIZE), ttl=int(Config.LOCAL_CACHE_TTL))
+# Invalidation generation per key with a Redis fetch in flight ([generation, fetches]),
+# so a value read before an invalidation is not put back into the L1 tier after it
+_local_fetches = {}
+_local_clear_generation = 0
 
 async def store_in_cache(identifier: str, data: dict, ttl: int = DEFAULT_REDIS_TTL) -> bool:
     try:
-        serialized_data = make_json_serializable(data)
-        return await client.set(f"{REDIS_PREFIX}{identifier}", json.dumps(serialized_data), ex=int(ttl))
+        return await client.set(f"{REDIS_PREFIX}{identifier}", encode_value(data), ex=int(ttl))
     except Exception as e:
         logger.error(f"Error storing in cache: {str(e)}")
         return False
 
 async def find_in_cache(identifier: str) -> Union[str, None]:
     try:
-        result = await client.get(f"{REDIS_PREFIX}{identifier}")
-        if result and isinstance(result, bytes):
-            return result.decode('utf-8')
+        result = decode_value(await client.get(f"{REDIS_PREFIX}{identifier}"))
+        increment_counter(CACHE_REQUESTS, cache='redis', result='hit' if result else 'miss')
         return result
     except Exception as e:
         logger.error(f"Error finding in cache: {str(e)}")
         return None
+
+async def find_many_in_cache(identifiers: List[str]) -> List[Union[str, None]]:
+    """Fetch several identifiers with a single MGET; results are in input order, None for misses."""
+    if not identifiers:
+        return []
+    try:
+        values = [decode_value(value) for value in await client.mget([f"{REDIS_PREFIX}{identifier}" for identifier in identifiers])]
+        for value in values:
+            increment_counter(CACHE_REQUESTS, cache='redis', result='hit' if value else 'miss')
+        return values
+    except Exception as e:
+        logger.error(f"Error finding many in cache: {str(e)}")
+        return [None] * len(identifiers)
+
+async def find_json_in_cache(identifier: str, use_local_cache: bool = False):
+    """
+    Return the decoded JSON value of identifier, or None. With use_local_cache the
+    decoded value is kept in the L1 tier; every caller gets its own copy, so it is
+    free to mutate the result.
+    """
+    if not use_local_cache:
+        return _decode_json(await find_in_cache(identifier))
+    return (await find_many_json_in_cache([identifier], use_local_cache=True))[0]
+
+async def find_many_json_in_cache(identifiers: List[str], use_local_cache: bool = False) -> list:
+    """
+    find_json_in_cache for several identifiers: L1 hits are served locally and the
+    rest are read with one MGET. Results are in input order, None for misses.
+    """
+    if not use_local_cache:
+        return [_decode_json(value) for value in await find_many_in_cache(identifiers)]
+
+    results = [None] * len(identifiers)
+    missing = []
+    for index, identifier in enumerate(identifiers):
+        if identifier in local_cache:
+            increment_counter(CACHE_REQUESTS, cache='local', result='hit')
+            results[index] = _copy_json(local_cache[identifier])
+        else:
+            missing.append(index)
+    if not missing:
+        return results
+
+    fetches = []
+    for index in missing:
+        fetch = _local_fetches.setdefault(identifiers[index], [0, 0])
+        fetch[1] += 1
+        fetches.append((fetch, fetch[0]))
+    started = _local_clear_generation
+    try:
+        values = await find_many_in_cache([identifiers[index] for index in missing])
+    finally:
+        for index, (fetch, _) in zip(missing, fetches):
+            fetch[1] -= 1
+            if not fetch[1] and _local_fetches.get(identifiers[index]) is fetch:
+                del _local_fetches[identifiers[index]]
+    for index, (fetch, generation), value in zip(missing, fetches, values):
+        result = _decode_json(value)
+        # Skip the L1 write if the key was invalidated while Redis was being read
+        if result is not None and fetch[0] == generation and _local_clear_generation == started:
+            local_cache[identifiers[index]] = result
+            result = _copy_json(result)
+        results[index] = result
+    return results
+
+def _decode_json(value):
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError) as e:
+        logger.error(f"Error decoding cached value: {str(e)}")
+        return None
+
+def _copy_json(value):
+    # Copies only the containers; strings and numbers are immutable and shared
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+async def store_many_in_cache(items: dict, ttl: int = DEFAULT_REDIS_TTL) -> bool:
+    """Store {identifier: data} pairs with one pipelined round-trip, each with the same TTL."""
+    if not items:
+        return True
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for identifier, data in items.items():
+                pipe.set(f"{REDIS_PREFIX}{identifier}", encode_value(data), ex=int(ttl))
+            await pipe.execute()
+        return True
+    except Exception as e:
+        logger.error(f"Error storing many in cache: {str(e)}")
+        return False
+
+async def increment_in_cache(identifier: str, amount: float, ttl: int = DEFAULT_REDIS_TTL) -> Union[float, None]:
+    """Atomically add amount to a numeric cache value and refresh its TTL."""
+    try:
+        key = f"{REDIS_PREFIX}{identifier}"
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.incrbyfloat(key, float(amount))
+            pipe.expire(key, int(ttl))
+            new_value, _ = await pipe.execute()
+        return float(new_value)
+    except Exception as e:
+        logger.error(f"Error incrementing in cache: {str(e)}")
+        return None
+
+async def invalidate_local_cache(identifiers: Union[str, List[str], None] = None):
+    """Drop identifiers (or everything when None) from the L1 tier of every worker."""
+    if isinstance(identifiers, str):
+        identifiers = [identifiers]
+    _drop_from_local_cache(identifiers)
+    try:
+        await client.publish(LOCAL_CACHE_INVALIDATION_CHANNEL, json.dumps(identifiers))
+    except Exception as error:
+        logger.error(f"Error publishing local cache invalidation: {str(error)}")
+
+def _drop_from_local_cache(identifiers):
+    global _local_clear_generation
+    if identifiers is None:
+        _local_clear_generation += 1
+        local_cache.clear()
+        return
+    for identifier in identifiers:
+        local_cache.pop(identifier, None)
+        fetch = _local_fetches.get(identifier)
+        if fetch is not None:
+            fetch[0] += 1
+
+async def listen_for_local_cache_invalidations():
+    """Background task applying invalidations published by other workers."""
+    while True:
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(LOCAL_CACHE_INVALIDATION_CHANNEL)
+            # Anything cached before the subscription was active may have missed an invalidation
+            _drop_from_local_cache(None)
+            async for message in pubsub.listen():
+                if message.get('type') == 'message':
+                    _drop_from_local_cache(json.loads(message['data']))
+        except asyncio.CancelledError:
+            await pubsub.aclose()
+            raise
+        except Exception as error:
+            logger.error(f"Local cache invalidation listener error: {str(error)}")
+            await pubsub.aclose()
+            await asyncio.sleep(5)
         
 async def delete_in_cache(identifiers: Union[str, List[str]]) -> bool:
-    if not await client.ping():
-        return False
-    
     if isinstance(identifiers, str):
         identifiers = [identifiers]
+    if not identifiers:
+        return True
     
     keys_to_delete = [f"{REDIS_PREFIX}{id}" for id in identifiers]
 
     try:
         delete_count = await client.delete(*keys_to_delete)
+        await invalidate_local_cache(identifiers)
         print(f"Deleted {delete_count} items from cache")
         return True
     except Exception as error:
@@ -80,11 +245,9 @@ async def clear_cache(request) -> JSONResponse:
             return JSONResponse(status_code=200, content={"message": message})
         elif await client.ping():
             # Scan for keys with the specific prefix
-            cursor = b'0'
-            while cursor:
-                cursor, keys = await client.scan(cursor=cursor, match=f"{REDIS_PREFIX}*")
-                if keys:
-                    await client.delete(*keys)
+            async for keys in _scan_keys(f"{REDIS_PREFIX}*"):
+                await client.delete(*keys)
+            await invalidate_local_cache()
             print("Cleared all items with prefix from cache")
             return JSONResponse(status_code=200, content={"message": "Redis cleared successfully"})
         else:
@@ -94,11 +257,23 @@ async def clear_cache(request) -> JSONResponse:
         logger.error(f"Error clearing cache: {str(error)}")
         return JSONResponse(status_code=500, content={"message": f"Error clearing cache: {error}"})
 
+async def _scan_keys(pattern: str):
+    """Yield batches of keys matching pattern using SCAN, without blocking Redis like KEYS."""
+    batch = []
+    async for key in client.scan_iter(match=pattern, count=SCAN_BATCH_SIZE):
+        batch.append(key)
+        if len(batch) >= SCAN_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
 async def find_in_cache_with_prefix(prefix: str) -> Union[List[str], None]:
     try:
-        pattern = f"{REDIS_PREFIX}{prefix}*"
-        keys = await client.keys(pattern)
-        values = [json.loads(await client.get(key)) for key in keys]  # Fetch values
+        values = []
+        async for keys in _scan_keys(f"{REDIS_PREFIX}{prefix}*"):
+            # Keys can expire between SCAN and MGET, so skip the gaps
+            values.extend(json.loads(decode_value(value)) for value in await client.mget(keys) if value)
         return values
     
     except Exception as e:
@@ -107,6 +282,8 @@ async def find_in_cache_with_prefix(prefix: str) -> Union[List[str], None]:
    
 def make_json_serializable(data):
     """Recursively converts non-serializable values in a dictionary to strings."""
+    if data is None or isinstance(data, (str, int, float, bool)):
+        return data
     if isinstance(data, dict):
         return {k: make_json_serializable(v) for k, v in data.items()}
     elif isinstance(data, (list, tuple, set, frozenset)):
@@ -155,4 +332,4 @@ async def release_lock(lock_key: str) -> bool:
         logger.error(f"Error releasing lock for {lock_key}: {str(e)}")
         return False
 
-__all__ = ['delete_in_cache', 'store_in_cache', 'find_in_cache', 'find_in_cache_and_expire', 'store_in_cache_permanent_until_read', 'verify_ttl', 'clear_cache', 'acquire_lock', 'release_lock']
+__all__ = ['delete_in_cache', 'store_in_cache', 'find_in_cache', 'find_many_in_cache', 'find_json_in_cache', 'find_many_json_in_cache', 'store_many_in_cache', 'increment_in_cache', 'find_in_cache_with_prefix', 'find_in_cache_and_expire', 'store_in_cache_permanent_until_read', 'verify_ttl', 'clear_cache', 'invalidate_local_cache', 'listen_for_local_cache_invalidations', 'acquire_lock', 'release_lock']
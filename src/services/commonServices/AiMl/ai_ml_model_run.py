@@ -1,22 +1,29 @@
-from openai import AsyncOpenAI
 import traceback
 from ..api_executor import execute_api_call
+from ..circuit_breaker import is_connection_error
+from ..sdk_client_pool import get_sdk_client
+from ..streaming import is_streaming, accumulate_chat_completion_stream
+from src.configs.constant import service_name
 from globals import *
 
 async def ai_ml_model_run(configuration, apiKey, execution_time_logs, bridge_id, timer, message_id=None, org_id=None, name = "", org_name= "", service = "", count=0, token_calculator=None):
     try:
-        openAI = AsyncOpenAI(api_key=apiKey, base_url='https://api.ai.ml/openai')
+        openAI = get_sdk_client(service_name['ai_ml'], apiKey, base_url='https://api.ai.ml/openai')
 
         # Define the API call function
         async def api_call(config):
             try:
+                if is_streaming():
+                    stream = await openAI.chat.completions.create(**config, stream=True, stream_options={'include_usage': True})
+                    return {'success': True, 'response': await accumulate_chat_completion_stream(stream)}
                 chat_completion = await openAI.chat.completions.create(**config)
                 return {'success': True, 'response': chat_completion.to_dict()}
             except Exception as error:
                 return {
                     'success': False,
                     'error': str(error),
-                    'status_code': getattr(error, 'status_code', None)
+                    'status_code': getattr(error, 'status_code', None),
+                    'connection_error': is_connection_error(error)
                 }
 
         # Execute API call with monitoring
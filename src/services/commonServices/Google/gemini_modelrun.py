@@ -1,6 +1,9 @@
-from openai import AsyncOpenAI
 import traceback
 from ..api_executor import execute_api_call
+from ..circuit_breaker import is_connection_error
+from ..sdk_client_pool import get_sdk_client
+from ..streaming import is_streaming, accumulate_chat_completion_stream
+from src.configs.constant import service_name
 # from src.services.utils.unified_token_validator import validate_gemini_token_limit
 from globals import *
 
@@ -11,18 +14,22 @@ async def gemini_modelrun(configuration, apiKey, execution_time_logs, bridge_id,
         # model_name = configuration.get('model')
         # validate_gemini_token_limit(configuration, model_name, service, apiKey)
         
-        gemini = AsyncOpenAI(api_key=apiKey, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
+        gemini = get_sdk_client(service_name['gemini'], apiKey, base_url="https://generativelanguage.googleapis.com/v1beta/openai/")
 
         # Define the API call function
         async def api_call(config):
             try:
+                if is_streaming():
+                    stream = await gemini.chat.completions.create(**config, stream=True, stream_options={'include_usage': True})
+                    return {'success': True, 'response': await accumulate_chat_completion_stream(stream)}
                 chat_completion = await gemini.chat.completions.create(**config)
                 return {'success': True, 'response': chat_completion.to_dict()}
             except Exception as error:
                 return {
                     'success': False,
                     'error': str(error),
-                    'status_code': getattr(error, 'status_code', None)
+                    'status_code': getattr(error, 'status_code', None),
+                    'connection_error': is_connection_error(error)
                 }
 
         # Execute API call with monitoring
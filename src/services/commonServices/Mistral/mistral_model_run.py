@@ -1,13 +1,15 @@
-from mistralai import Mistral
 from mistralai.models import UserMessage
 import traceback
 from ..api_executor import execute_api_call
+from ..circuit_breaker import is_connection_error
+from ..sdk_client_pool import get_sdk_client
+from src.configs.constant import service_name
 from globals import *
 
 
 async def mistral_model_run(configuration, apiKey, execution_time_logs, bridge_id, timer, message_id=None, org_id=None, name = "", org_name= "", service = "", count=0, token_calculator=None):
     try:
-        mistral = Mistral(api_key=apiKey)
+        mistral = get_sdk_client(service_name['mistral'], apiKey)
 
         # Define the API call function
         async def api_call(config):
@@ -18,7 +20,8 @@ async def mistral_model_run(configuration, apiKey, execution_time_logs, bridge_i
                 return {
                     'success': False,
                     'error': str(error),
-                    'status_code': getattr(error, 'status_code', None)
+                    'status_code': getattr(error, 'status_code', None),
+                    'connection_error': is_connection_error(error)
                 }
 
         # Execute API call with monitoring
@@ -1,7 +1,10 @@
-from anthropic import AsyncAnthropic
 import traceback
 import json
 from ..api_executor import execute_api_call
+from ..circuit_breaker import is_connection_error
+from ..sdk_client_pool import get_sdk_client
+from ..streaming import emit_stream_delta
+from src.configs.constant import service_name
 # from src.services.utils.unified_token_validator import validate_anthropic_token_limit
 from globals import *
 
@@ -13,7 +16,7 @@ async def anthropic_runmodel(configuration, apikey, execution_time_logs, bridge_
         # validate_anthropic_token_limit(configuration, model_name, service, apikey)
         
         # Initialize async client
-        anthropic_client = AsyncAnthropic(api_key=apikey)
+        anthropic_client = get_sdk_client(service_name['anthropic'], apikey)
 
         # Define the API call function with streaming
         async def api_call(config):
@@ -81,6 +84,7 @@ async def anthropic_runmodel(configuration, apikey, execution_time_logs, bridge_
                             if delta.type == 'text_delta':
                                 block.setdefault('text', '')
                                 block['text'] += delta.text
+                                emit_stream_delta(delta.text)
                             elif delta.type == 'input_json_delta' and block.get('type') == 'tool_use':
                                 # For tool use, we need to accumulate the JSON string
                                 block.setdefault('partial_json', '')
@@ -166,7 +170,8 @@ async def anthropic_runmodel(configuration, apikey, execution_time_logs, bridge_
                 return {
                     'success': False,
                     'error': str(error),
-                    'status_code': getattr(error, 'status_code', None)
+                    'status_code': getattr(error, 'status_code', None),
+                    'connection_error': is_connection_error(error)
                 }
 
         # Execute API call with monitoring
@@ -1,8 +1,11 @@
 import asyncio
 import copy
+import time
 import traceback
 from ..utils.ai_middleware_format import send_alert
 from src.configs.constant import service_name
+from ..utils.prometheus_metrics import observe_stage, increment_counter, PROVIDER_ERRORS, CIRCUIT_BREAKER_REJECTIONS
+from .circuit_breaker import get_circuit_breaker, is_provider_failure, fallback_available, CLOSED
 
 async def execute_api_call(
     configuration,
@@ -19,16 +22,40 @@ async def execute_api_call(
     count = 0,
     token_calculator = None
 ):
+    model = configuration.get('model')
+    breaker = get_circuit_breaker(service, model)
+    # Only fail fast when there is a fall_back to go to; otherwise the provider is still the best bet
+    fail_fast = fallback_available.get()
+    if fail_fast and not breaker.allow_request():
+        # Provider is failing for everyone; fail fast so chat() can go to the fall_back
+        increment_counter(CIRCUIT_BREAKER_REJECTIONS, service=service, model=model)
+        execution_time_logs.append({"step": f"{service} call skipped :- circuit breaker open for {model}", "time_taken": 0})
+        return {
+            'success': False,
+            'error': f"{service}/{model} is temporarily unavailable after repeated provider failures, please retry shortly",
+            'status_code': 503
+        }
+
     try:
         # Start timer
         timer.start()
 
         # Execute the API call (no retry/fallback)
         config = copy.deepcopy(configuration)
-        result = await api_call(config)
+        call_started = time.monotonic()
+        try:
+            result = await api_call(config)
+        except BaseException:
+            if fail_fast:
+                breaker.release()
+            raise
+        if fail_fast or breaker.state == CLOSED:
+            breaker.record(is_provider_failure(result), time.monotonic() - call_started)
 
         # Log execution time
-        execution_time_logs.append({"step": f"{service} Processing time for call :- {count + 1}", "time_taken": timer.stop("API chat completion")})
+        time_taken = timer.stop("API chat completion")
+        execution_time_logs.append({"step": f"{service} Processing time for call :- {count + 1}", "time_taken": time_taken})
+        observe_stage('provider_call', time_taken, service=service)
 
         if result['success']:
             result['response'] = await check_space_issue(result['response'], service)
@@ -36,6 +63,7 @@ async def execute_api_call(
             return result
         else:
             print("API call failed with error:", result['error'])
+            increment_counter(PROVIDER_ERRORS, service=service)
             traceback.print_exc()
             
             # Send alert if required (even on failure)
@@ -54,7 +82,10 @@ async def execute_api_call(
             return result
 
     except Exception as e:
-        execution_time_logs.append({"step": f"{service} Processing time for call :- {count + 1}", "time_taken": timer.stop("API chat completion")})
+        time_taken = timer.stop("API chat completion")
+        execution_time_logs.append({"step": f"{service} Processing time for call :- {count + 1}", "time_taken": time_taken})
+        observe_stage('provider_call', time_taken, service=service)
+        increment_counter(PROVIDER_ERRORS, service=service)
         print("execute_api_call error=>", e)
         traceback.print_exc()
         return {
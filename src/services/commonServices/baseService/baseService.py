@@ -20,11 +20,15 @@ from ..Google.gemini_image_model import gemini_image_model
 from ..Google.gemini_video_model import gemini_video_model
 from ..AiMl.ai_ml_model_run import ai_ml_model_run
 from ..AiMl.ai_ml_image_model import AiMlImageModel
+from ..response_cache import response_cache_key, find_cached_response, store_cached_response
+from ..semantic_cache import semantic_namespace, find_semantic_response, store_semantic_response
+from ..streaming import is_streaming, start_stream_round
 from concurrent.futures import ThreadPoolExecutor
 from globals import *
 
 
 executor = ThreadPoolExecutor(max_workers= int(Config.max_workers) or 10)
+ANTHROPIC_THREAD_EXECUTOR = (Config.ANTHROPIC_THREAD_EXECUTOR or "").lower() == "true"
 
 class BaseService:
     def __init__(self, params):
@@ -77,6 +81,8 @@ class BaseService:
         self.folder_id = params.get('folder_id')
         self.bridge_configurations = params.get('bridge_configurations')
         self.owner_id = params.get('owner_id')
+        self.response_cache = params.get('response_cache') or {}
+        self.semantic_cache = params.get('semantic_cache') or {}
 
 
     def aiconfig(self):
@@ -295,11 +301,24 @@ class BaseService:
     async def chats(self, configuration, apikey, service, count=0):
         try:
             response = {}
+            cache_state, cached_response = await self.find_cached_chat_response(configuration, service, count)
+            if cached_response is not None:
+                # Served without a provider call, so nothing is added to the token usage
+                self.execution_time_logs.append({"step": f"{service} response served from cache for call :- {count + 1}", "time_taken": 0})
+                return {
+                    'success': True,
+                    'modelResponse': cached_response
+                }
+            start_stream_round()
             loop = asyncio.get_event_loop()
             if service == service_name['openai']:
                 response = await openai_response_model(configuration, apikey, self.execution_time_logs, self.bridge_id, self.timer, self.message_id, self.org_id, self.name, self.org_name, service, count, self.token_calculator)
             elif service == service_name['anthropic']:
-                response = await loop.run_in_executor(executor, lambda: asyncio.run(anthropic_runmodel(configuration, apikey, self.execution_time_logs, self.bridge_id, self.timer, self.name, self.org_name, service, count, self.token_calculator)))
+                if ANTHROPIC_THREAD_EXECUTOR:
+                    # Compatibility mode: run on a fresh event loop inside the thread pool
+                    response = await loop.run_in_executor(executor, lambda: asyncio.run(anthropic_runmodel(configuration, apikey, self.execution_time_logs, self.bridge_id, self.timer, self.name, self.org_name, service, count, self.token_calculator)))
+                else:
+                    response = await anthropic_runmodel(configuration, apikey, self.execution_time_logs, self.bridge_id, self.timer, self.name, self.org_name, service, count, self.token_calculator)
             elif service == service_name['groq']:
                 response = await groq_runmodel(configuration, apikey, self.execution_time_logs, self.bridge_id,  self.timer, self.message_id, self.org_id, self.name, self.org_name, service, count, self.token_calculator)
             elif service == service_name['grok']:
@@ -316,6 +335,7 @@ class BaseService:
                 response = await openai_completion(configuration, apikey, self.execution_time_logs, self.bridge_id, self.timer, self.message_id, self.org_id, self.name, self.org_name, service, count, self.token_calculator)
             if not response['success']:
                 raise ValueError(response['error'])
+            await self.store_cached_chat_response(cache_state, response['response'])
             return {
                 'success': True,
                 'modelResponse': response['response']
@@ -324,6 +344,41 @@ class BaseService:
             logger.error(f"chats error=>, {str(e)}, {traceback.format_exc()}")
             raise ValueError(f"error occurs from {self.service} api {e.args[0]}", *e.args[1:], self.func_tool_call_data)
 
+    def is_semantic_cacheable(self, count):
+        # Only the first call for a standalone text question: history, memory, tool rounds,
+        # attachments and images make the answer depend on more than the user message
+        return (count == 0 and isinstance(self.user, str) and self.user.strip() and not self.tool_call
+                and not (self.configuration or {}).get('conversation') and not self.memory
+                and not self.image_data and not self.files and self.type != 'image')
+
+    async def find_cached_chat_response(self, configuration, service, count):
+        """Look up the exact-match and semantic caches enabled on the bridge; returns (cache_state, cached_response)."""
+        cache_state = {}
+        # Streamed responses are not cached: a hit would send nothing to the stream
+        if is_streaming():
+            return cache_state, None
+        if self.response_cache.get('is_enable'):
+            cache_state['exact_key'] = response_cache_key(service, configuration, self.org_id, self.bridge_id)
+            cached_response = await find_cached_response(cache_state['exact_key'])
+            if cached_response is not None:
+                return cache_state, cached_response
+        if self.semantic_cache.get('is_enable') and self.is_semantic_cacheable(count):
+            namespace = semantic_namespace(service, self.model, self.configuration.get('prompt'), self.org_id, self.bridge_id)
+            # Embed with the bridge's own key when it is an OpenAI key
+            embedding_key = self.apikey if service == service_name['openai'] else None
+            cached_response, vector = await find_semantic_response(namespace, self.user, self.semantic_cache, embedding_key)
+            cache_state['semantic'] = (namespace, vector, embedding_key)
+            return cache_state, cached_response
+        return cache_state, None
+
+    async def store_cached_chat_response(self, cache_state, model_response):
+        if cache_state.get('exact_key'):
+            await store_cached_response(cache_state['exact_key'], model_response, self.response_cache)
+        if cache_state.get('semantic'):
+            namespace, vector, embedding_key = cache_state['semantic']
+            # May still need to embed the question, so it runs after the response instead of before it
+            asyncio.create_task(store_semantic_response(namespace, vector, self.user, model_response, self.semantic_cache, embedding_key))
+
     async def replace_variables_in_args(self, codes_mapping):
         variables = self.variables
         variables_path = self.variables_path
@@ -8,6 +8,10 @@ import pydash as _
 from src.services.utils.apiservice import fetch
 from fastapi import Request
 import datetime
+import hashlib
+import orjson
+from collections import OrderedDict
+from config import Config
 from src.controllers.rag_controller import get_text_from_vectorsQuery
 from globals import *
 from src.db_services.ConfigurationServices import get_bridges_without_tools, update_bridge
@@ -16,6 +20,7 @@ from src.services.utils.built_in_tools.firecrawl import call_firecrawl_scrape
 from globals import *
 from src.services.cache_service import store_in_cache, find_in_cache, client, REDIS_PREFIX
 from src.configs.constant import redis_keys,inbuild_tools
+from src.services.utils.prometheus_metrics import stage_timer, observe_stage
 
 def clean_json(data):
     """Recursively remove keys with empty string, empty list, or empty dictionary."""
@@ -109,7 +114,43 @@ def transform_required_params_to_required(properties, variables={}, variables_pa
                 transformed_properties[key]['items']['type'] = 'array'
     return transformed_properties
 
-def tool_call_formatter(configuration: dict, service: str, variables: dict, variables_path: dict) -> dict: # changes
+TOOL_SCHEMA_CACHE_SIZE = int(Config.TOOL_SCHEMA_CACHE_SIZE)
+_tool_schema_cache = OrderedDict()  # (service, tools digest, filled variable params) -> serialized provider tools
+
+def filled_variable_params(variables, variables_path):
+    """Tool params dropped from the schema because a variable already supplies their value."""
+    if not variables_path:
+        return ()
+    return tuple(sorted(
+        (function_name, key)
+        for function_name, mapping in variables_path.items() if mapping
+        for key, variable_path in mapping.items()
+        if get_nested_value(variables, variable_path)
+    ))
+
+def tool_call_formatter(configuration: dict, service: str, variables: dict, variables_path: dict) -> list:
+    """
+    Provider-specific tool array for the bridge's tools. Formatting is cached per
+    worker by service, tool definitions and the params filled from variables, so
+    tool rounds and later requests to an unchanged bridge skip the schema rebuild;
+    editing the tools changes the digest, so stale entries are simply never hit.
+    """
+    serialized_tools = orjson.dumps(configuration.get('tools', []), default=str, option=orjson.OPT_SORT_KEYS)
+    cache_key = (service, hashlib.sha256(serialized_tools).hexdigest(), filled_variable_params(variables, variables_path))
+    cached = _tool_schema_cache.get(cache_key)
+    if cached is not None:
+        _tool_schema_cache.move_to_end(cache_key)
+        # Fresh objects every time: callers append to and edit the returned tools
+        return orjson.loads(cached)
+
+    # Format a copy, the transformation edits the schemas it walks
+    data_to_send = format_tools_for_service({'tools': orjson.loads(serialized_tools)}, service, variables, variables_path)
+    _tool_schema_cache[cache_key] = orjson.dumps(data_to_send, default=str)
+    while len(_tool_schema_cache) > TOOL_SCHEMA_CACHE_SIZE:
+        _tool_schema_cache.popitem(last=False)
+    return data_to_send
+
+def format_tools_for_service(configuration: dict, service: str, variables: dict, variables_path: dict) -> list: # changes
     if service == service_name['openai_completion'] or service == service_name['open_router'] or service == service_name['mistral'] or service == service_name['gemini'] or service == service_name['ai_ml']:
         data_to_send =  [
             {
@@ -202,12 +243,13 @@ async def sendResponse(response_format, data, success = False, variables={}):
         'response' if success else 'error': data,
         'success': success
     }
-    match response_format['type']:
-        case 'RTLayer' : 
-            return await send_message(cred = response_format['cred'], data=data_to_send)
-        case 'webhook':
-            data_to_send['variables'] = variables
-            return await send_request(**response_format['cred'], method='POST', data=data_to_send)
+    with stage_timer('send_response', type=response_format['type']):
+        match response_format['type']:
+            case 'RTLayer' : 
+                return await send_message(cred = response_format['cred'], data=data_to_send)
+            case 'webhook':
+                data_to_send['variables'] = variables
+                return await send_request(**response_format['cred'], method='POST', data=data_to_send)
 
 async def process_data_and_run_tools(codes_mapping, self):
     try: 
@@ -310,7 +352,9 @@ async def process_data_and_run_tools(codes_mapping, self):
 
         # Record executed function names and timing
         executed_names = ", ".join(executed_functions) if executed_functions else "No functions executed"
-        self.function_time_logs.append({"step": executed_names, "time_taken": self.timer.stop("process_data_and_run_tools")})
+        time_taken = self.timer.stop("process_data_and_run_tools")
+        self.function_time_logs.append({"step": executed_names, "time_taken": time_taken})
+        observe_stage('tool_round', time_taken)
 
         return responses, mapping, tool_call_logs
 
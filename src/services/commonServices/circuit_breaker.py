@@ -0,0 +1,144 @@
+import time
+from collections import deque
+from contextvars import ContextVar
+from config import Config
+from globals import *
+
+# Per-(service, model) circuit breakers for provider calls. While a breaker is
+# open, execute_api_call fails immediately instead of waiting for the provider
+# to time out, so chat() moves straight to the configured fall_back. Requests
+# without a fall_back still go to the provider. Breaker state is per worker process.
+
+CIRCUIT_BREAKER_ENABLED = (Config.CIRCUIT_BREAKER_ENABLED or "true").lower() == "true"
+WINDOW_SECONDS = float(Config.CIRCUIT_BREAKER_WINDOW)
+MIN_REQUESTS = int(Config.CIRCUIT_BREAKER_MIN_REQUESTS)
+ERROR_RATE_THRESHOLD = float(Config.CIRCUIT_BREAKER_ERROR_RATE)
+SLOW_CALL_SECONDS = float(Config.CIRCUIT_BREAKER_SLOW_CALL_SECONDS)
+SLOW_CALL_RATE_THRESHOLD = float(Config.CIRCUIT_BREAKER_SLOW_CALL_RATE)
+OPEN_SECONDS = float(Config.CIRCUIT_BREAKER_OPEN_SECONDS)
+HALF_OPEN_PROBES = int(Config.CIRCUIT_BREAKER_HALF_OPEN_PROBES)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Names of exception classes (matched anywhere in the MRO) that mean the provider
+# could not be reached or did not answer in time, across the provider SDKs
+CONNECTION_ERROR_NAMES = {
+    'APIConnectionError', 'APITimeoutError', 'TimeoutError', 'TransportError',
+    'ClientConnectionError', 'ServerTimeoutError',
+}
+
+# Whether the request being served has a fall_back to switch to; set by chat()
+fallback_available: ContextVar = ContextVar('fallback_available', default=False)
+
+
+def is_connection_error(error):
+    return any(cls.__name__ in CONNECTION_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def is_provider_failure(result):
+    """
+    Whether a failed call should count against the provider. Only 5xx responses
+    and connection errors/timeouts do; 4xx responses such as an invalid key or a
+    per-key rate limit, and local errors such as a bad bridge configuration, are
+    specific to the caller.
+    """
+    if result.get('success'):
+        return False
+    status_code = result.get('status_code')
+    if status_code is not None:
+        return status_code >= 500
+    return bool(result.get('connection_error'))
+
+
+class CircuitBreaker:
+    def __init__(self, name):
+        self.name = name
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.calls = deque()  # (finished_at, failed, slow)
+        self.failures = 0
+        self.slow_calls = 0
+
+    def _prune(self, now):
+        while self.calls and now - self.calls[0][0] > WINDOW_SECONDS:
+            _, failed, slow = self.calls.popleft()
+            self.failures -= failed
+            self.slow_calls -= slow
+
+    def _reset_window(self):
+        self.calls.clear()
+        self.failures = 0
+        self.slow_calls = 0
+
+    def allow_request(self):
+        """Return True if a call may go to the provider; half-open admits a few probes."""
+        if not CIRCUIT_BREAKER_ENABLED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < OPEN_SECONDS:
+                return False
+            self.state = HALF_OPEN
+            self.probes_in_flight = 0
+            logger.info(f"Circuit breaker {self.name} half-open, probing provider")
+        if self.state == HALF_OPEN:
+            if self.probes_in_flight >= HALF_OPEN_PROBES:
+                return False
+            self.probes_in_flight += 1
+        return True
+
+    def release(self):
+        """Give back a half-open probe slot for a call that ended without a result (e.g. cancelled)."""
+        if self.state == HALF_OPEN:
+            self.probes_in_flight = max(self.probes_in_flight - 1, 0)
+
+    def record(self, failed, latency):
+        if not CIRCUIT_BREAKER_ENABLED:
+            return
+        now = time.monotonic()
+        if self.state == HALF_OPEN:
+            self.probes_in_flight = max(self.probes_in_flight - 1, 0)
+            if failed:
+                self._open(now, "probe failed")
+            else:
+                self.state = CLOSED
+                self._reset_window()
+                logger.info(f"Circuit breaker {self.name} closed after successful probe")
+            return
+        if self.state == OPEN:
+            # Call started before the breaker opened
+            return
+
+        # Slow-call tripping is opt-in: long reasoning or streamed generations are not failures
+        slow = SLOW_CALL_SECONDS > 0 and latency >= SLOW_CALL_SECONDS
+        self.calls.append((now, failed, slow))
+        self.failures += failed
+        self.slow_calls += slow
+        self._prune(now)
+
+        total = len(self.calls)
+        if total < MIN_REQUESTS:
+            return
+        if self.failures / total >= ERROR_RATE_THRESHOLD:
+            self._open(now, f"error rate {self.failures}/{total}")
+        elif self.slow_calls / total >= SLOW_CALL_RATE_THRESHOLD:
+            self._open(now, f"slow call rate {self.slow_calls}/{total}")
+
+    def _open(self, now, reason):
+        self.state = OPEN
+        self.opened_at = now
+        self._reset_window()
+        logger.warning(f"Circuit breaker {self.name} opened ({reason}), failing fast for {OPEN_SECONDS}s")
+
+
+_breakers = {}
+
+
+def get_circuit_breaker(service, model):
+    key = (service, model)
+    breaker = _breakers.get(key)
+    if breaker is None:
+        breaker = _breakers[key] = CircuitBreaker(f"{service}/{model}")
+    return breaker
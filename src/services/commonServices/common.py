@@ -40,7 +40,7 @@ from src.services.utils.common_utils import (
     update_cost_and_last_used_in_background,
     setup_agent_pre_tools
 )
-from src.services.utils.guardrails_validator import guardrails_check
+from src.services.utils.guardrails_validator import guardrails_check, is_optimistic_guardrails
 from src.services.utils.rich_text_support import process_chatbot_response
 app = FastAPI()
 from src.services.utils.helper import Helper
@@ -48,6 +48,9 @@ from globals import *
 from src.services.cache_service import find_in_cache, store_in_cache
 from src.configs.constant import redis_keys
 from .baseService.utils import unknown_error_handler
+from src.services.utils.prometheus_metrics import stage_timer, increment_counter, FALLBACKS
+from .hedging import get_hedge_config, execute_with_hedge
+from .circuit_breaker import fallback_available
 
 configurationModel = db["configurations"]
 
@@ -121,11 +124,14 @@ async def chat_multiple_agents(request_body):
 async def chat(request_body): 
     result ={}
     class_obj= {}
+    guardrails_task = None
     try:
         # Store bridge_configurations for potential transfer logic
         bridge_configurations = request_body.get('body', {}).get('bridge_configurations', {})
         # Step 1: Parse and validate request body
         parsed_data = parse_request_body(request_body)
+        # Open circuit breakers only fail fast when there is a fall_back to switch to
+        fallback_available.set(bool((parsed_data.get('fall_back') or {}).get('is_enable')))
         
         # Setup pre_tools for the current agent with its own variables
         setup_agent_pre_tools(parsed_data, bridge_configurations)
@@ -138,10 +144,15 @@ async def chat(request_body):
         if transfer_request_id not in TRANSFER_HISTORY:
             TRANSFER_HISTORY[transfer_request_id] = []
         if parsed_data.get('guardrails',{}).get('is_enabled', False):
-            guardrails_result = await guardrails_check(parsed_data)
-            if guardrails_result is not None:
-                # Content was blocked by guardrails, return the blocked response
-                return JSONResponse(status_code=200, content=guardrails_result)
+            if is_optimistic_guardrails(parsed_data):
+                # Checked concurrently with the provider call; awaited before anything is sent
+                guardrails_task = asyncio.create_task(guardrails_check(parsed_data))
+            else:
+                with stage_timer('guardrails'):
+                    guardrails_result = await guardrails_check(parsed_data)
+                if guardrails_result is not None:
+                    # Content was blocked by guardrails, return the blocked response
+                    return JSONResponse(status_code=200, content=guardrails_result)
 
         parsed_data['configuration']['prompt'] = add_default_template(parsed_data.get('configuration', {}).get('prompt', ''))
         parsed_data['variables'] = add_user_in_varaibles(parsed_data['variables'], parsed_data['user'])
@@ -159,7 +170,8 @@ async def chat(request_body):
         await handle_pre_tools(parsed_data)
 
         # Step 5: Manage Threads
-        thread_info = await manage_threads(parsed_data)
+        with stage_timer('thread_fetch'):
+            thread_info = await manage_threads(parsed_data)
         # add Files from cache is Present
         if len(parsed_data['files']) == 0:
             parsed_data['files'] = await add_files_to_parse_data(parsed_data['thread_id'], parsed_data['sub_thread_id'], parsed_data['bridge_id'])
@@ -207,8 +219,20 @@ async def chat(request_body):
         class_obj = await Helper.create_service_handler(params, parsed_data['service'])
         
         original_exception = None
+        fallback_tried = False
         try:
-            result = await class_obj.execute()
+            hedge_config = get_hedge_config(parsed_data)
+            if hedge_config:
+                hedged = await execute_with_hedge(
+                    class_obj, params, parsed_data, timer, hedge_config,
+                    lambda hedge_data, hedge_timer: prepare_fallback_handler(hedge_data, thread_info, hedge_timer, memory, bridge_configurations)
+                )
+                result, class_obj, params = hedged['result'], hedged['class_obj'], hedged['params']
+                fallback_tried = hedged['fallback_tried']
+                if hedged['fallback_won']:
+                    parsed_data.update(hedged['parsed_data'])
+            else:
+                result = await class_obj.execute()
             
             # Check if agent transfer is needed
             transfer_agent_config = result.get('transfer_agent_config')
@@ -216,6 +240,13 @@ async def chat(request_body):
                 # Get the correct version_id from bridge_configurations for this agent
                 current_version_id = bridge_configurations.get(parsed_data['bridge_id'], {}).get('version_id', parsed_data['version_id'])
                 
+                # The transferred agent's answer is sent to the user, so the verdict must pass first
+                if guardrails_task is not None:
+                    blocked_response = await guardrails_blocked_response(guardrails_task, parsed_data, params)
+                    guardrails_task = None
+                    if blocked_response is not None:
+                        return blocked_response
+
                 # Calculate tokens and create latency BEFORE storing history for transfer
                 if parsed_data.get('type') != 'image':
                     parsed_data['tokens'] = params['token_calculator'].calculate_total_cost(parsed_data['model'], parsed_data['service'])
@@ -264,13 +295,14 @@ async def chat(request_body):
                 "modelResponse": {}
             }
         
-        # Retry mechanism with fallback configuration
-        if execution_failed and parsed_data.get('fall_back') and parsed_data['fall_back'].get('is_enable', False):
+        # Retry mechanism with fallback configuration (skipped if a hedge already tried it)
+        if execution_failed and not fallback_tried and parsed_data.get('fall_back') and parsed_data['fall_back'].get('is_enable', False):
             try:
                 # Store original configuration
                 fallback_config = parsed_data['fall_back']
                 original_model = parsed_data['model']
                 original_service = parsed_data['service']
+                increment_counter(FALLBACKS, service=original_service, fallback_service=fallback_config.get('service', original_service))
                 
                 # Update parsed_data with fallback configuration
                 parsed_data['model'] = fallback_config.get('model', parsed_data['model'])
@@ -282,35 +314,8 @@ async def chat(request_body):
                     if parsed_data['apikey'] is None and fallback_config.get('service') == 'ai_ml':
                         parsed_data['apikey'] = Config.AI_ML_APIKEY
                     
-                    # Load fresh model configuration for the fallback service and model
-                    fallback_model_config, fallback_custom_config, fallback_model_output_config = await load_model_configuration(
-                        parsed_data['model'], parsed_data['configuration'], parsed_data['service']
-                    )
-            
-                    # Configure custom settings specifically for the fallback service
-                    fallback_custom_config = await configure_custom_settings(
-                        fallback_model_config['configuration'], fallback_custom_config, parsed_data['service']
-                    )
-                    params = build_service_params(
-                        parsed_data, fallback_custom_config, fallback_model_output_config, thread_info, timer, memory, send_error_to_webhook, bridge_configurations
-                    )
-                    # Step 9 : json_schema service conversion
-                    fallback_response_type = fallback_custom_config.get('response_type')
-                    if isinstance(fallback_response_type, dict) and fallback_response_type.get('type') == 'json_schema':
-                        if 'json_schema' in fallback_response_type:
-                            fallback_custom_config['response_type'] = restructure_json_schema(
-                                fallback_response_type,
-                                parsed_data['service'],
-                            )
-                        else:
-                            logger.warning(
-                                f"fallback response_type missing json_schema before restructure: "
-                                f"bridge_id={parsed_data.get('bridge_id')} service={parsed_data.get('service')} "
-                                f"response_type_keys={list(fallback_response_type.keys())}"
-                            )
-                    
-                    # Create new service handler for the fallback service
-                    class_obj = await Helper.create_service_handler(params, parsed_data['service'])
+                    # Load fresh model configuration and create a new service handler for the fallback service
+                    class_obj, params = await prepare_fallback_handler(parsed_data, thread_info, timer, memory, bridge_configurations)
                 else:
                     # Same service, just update existing class_obj
                     class_obj.model = parsed_data['model']
@@ -325,7 +330,8 @@ async def chat(request_body):
                         model_config['configuration'], custom_config, parsed_data['service']
                     )
                 
-                # Execute with updated configuration
+                # Execute with updated configuration; nothing left to fall back to
+                fallback_available.set(False)
                 result = await class_obj.execute()
                 result['response']['usage'] = params['token_calculator'].get_total_usage()
                 
@@ -344,6 +350,12 @@ async def chat(request_body):
         
         if not result["success"]:
             raise ValueError(result)
+
+        if guardrails_task is not None:
+            blocked_response = await guardrails_blocked_response(guardrails_task, parsed_data, params)
+            guardrails_task = None
+            if blocked_response is not None:
+                return blocked_response
         # Add message_id to response
         result['response']['data']['message_id'] = parsed_data['message_id']
 
@@ -446,6 +458,53 @@ async def chat(request_body):
         if parsed_data['is_playground'] and parsed_data['body']['bridge_configurations'].get('playground_response_format'):
             await sendResponse(parsed_data['body']['bridge_configurations']['playground_response_format'], error_object, success=False, variables=parsed_data.get('variables',{}))
         raise ValueError(error_object)
+    finally:
+        # An optimistic guardrails check that was never awaited (early return or error) must not outlive the request
+        if guardrails_task is not None and not guardrails_task.done():
+            guardrails_task.cancel()
+
+async def guardrails_blocked_response(guardrails_task, parsed_data, params):
+    """Await an optimistic guardrails check; returns the blocked response, or None if the content passed."""
+    with stage_timer('guardrails'):
+        guardrails_result = await guardrails_task
+    if guardrails_result is None:
+        return None
+    # Suppress the response, but the provider call already happened so its cost is still recorded
+    if parsed_data.get('type') != 'image':
+        parsed_data['tokens'] = params['token_calculator'].calculate_total_cost(parsed_data['model'], parsed_data['service'])
+    await update_cost_and_last_used_in_background(parsed_data)
+    return JSONResponse(status_code=200, content=guardrails_result)
+
+async def prepare_fallback_handler(parsed_data, thread_info, timer, memory, bridge_configurations):
+    """Build the service handler and params for the service/model currently set on parsed_data."""
+    fallback_model_config, fallback_custom_config, fallback_model_output_config = await load_model_configuration(
+        parsed_data['model'], parsed_data['configuration'], parsed_data['service']
+    )
+
+    # Configure custom settings specifically for the fallback service
+    fallback_custom_config = await configure_custom_settings(
+        fallback_model_config['configuration'], fallback_custom_config, parsed_data['service']
+    )
+    params = build_service_params(
+        parsed_data, fallback_custom_config, fallback_model_output_config, thread_info, timer, memory, send_error_to_webhook, bridge_configurations
+    )
+    # json_schema service conversion
+    fallback_response_type = fallback_custom_config.get('response_type')
+    if isinstance(fallback_response_type, dict) and fallback_response_type.get('type') == 'json_schema':
+        if 'json_schema' in fallback_response_type:
+            fallback_custom_config['response_type'] = restructure_json_schema(
+                fallback_response_type,
+                parsed_data['service'],
+            )
+        else:
+            logger.warning(
+                f"fallback response_type missing json_schema before restructure: "
+                f"bridge_id={parsed_data.get('bridge_id')} service={parsed_data.get('service')} "
+                f"response_type_keys={list(fallback_response_type.keys())}"
+            )
+
+    class_obj = await Helper.create_service_handler(params, parsed_data['service'])
+    return class_obj, params
 
 @handle_exceptions
 async def embedding(request_body):
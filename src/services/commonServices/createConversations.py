@@ -61,8 +61,8 @@ class ConversationService:
                 threads.append({'role': 'user', 'content': [{"type": "text", "text": f"GPT-Memory Data:- {memory}"}]})
                 threads.append({'role': 'assistant', 'content': [{"type": "text", "text": "memory updated."}]})
             
-            # Process image URLs if present
-            image_urls = [url.get('url') for message in conversation for url in message.get('user_urls', [])]
+            # Only images are sent inline as base64; PDFs and other files are passed by URL
+            image_urls = list(dict.fromkeys(url.get('url') for message in conversation for url in message.get('user_urls', []) if url.get('type') == 'image'))
             images_data = await fetch_images_b64(image_urls) if image_urls else []
             images = {url: data for url, data in zip(image_urls, images_data)}
             
@@ -91,7 +91,7 @@ class ConversationService:
                     image_data = []
                     for url_info in message['user_urls']:
                         url = url_info.get("url")
-                        if url in images:
+                        if url:
                             img_type = url_info.get("type")
                             if img_type == 'image':
                                 image_data.append({
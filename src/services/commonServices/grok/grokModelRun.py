@@ -1,6 +1,7 @@
 import traceback
 import os
 from ..api_executor import execute_api_call
+from ..circuit_breaker import is_connection_error
 from ...utils.apiservice import fetch
 from globals import *
 
@@ -33,7 +34,8 @@ async def grok_runmodel(configuration, api_key, execution_time_logs, bridge_id,
             return {
                 "success": False,
                 "error": str(error),
-                "status_code": getattr(error, 'status_code', None)
+                "status_code": getattr(error, 'status_code', None),
+                "connection_error": is_connection_error(error)
             }
 
     try:
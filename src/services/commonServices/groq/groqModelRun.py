@@ -1,23 +1,31 @@
 from groq import AsyncGroq
 import traceback
 from ..api_executor import execute_api_call
+from ..circuit_breaker import is_connection_error
+from ..sdk_client_pool import get_sdk_client
+from ..streaming import is_streaming, accumulate_chat_completion_stream
+from src.configs.constant import service_name
 from globals import *
 
 async def groq_runmodel(configuration, apiKey, execution_time_logs, bridge_id, timer, message_id, org_id, name = "", org_name = "", service = "", count = 0, token_calculator=None):
     try:
         # Initialize async client
-        groq_client = AsyncGroq(api_key=apiKey)
+        groq_client = get_sdk_client(service_name['groq'], apiKey)
 
         # Define the API call function
         async def api_call(config):
             try:
+                if is_streaming():
+                    stream = await groq_client.chat.completions.create(**config, stream=True)
+                    return {'success': True, 'response': await accumulate_chat_completion_stream(stream)}
                 response = await groq_client.chat.completions.create(**config)
                 return {'success': True, 'response': response.to_dict()}
             except Exception as error:
                 return {
                     'success': False,
                     'error': str(error),
-                    'status_code': getattr(error, 'status_code', None)
+                    'status_code': getattr(error, 'status_code', None),
+                    'connection_error': is_connection_error(error)
                 }
 
         # Execute API call with monitoring
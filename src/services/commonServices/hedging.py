@@ -0,0 +1,189 @@
+import asyncio
+import copy
+import json
+import time
+from collections import deque
+from config import Config
+from globals import *
+from src.configs.model_configuration import model_config_document
+from src.services.utils.common_utils import initialize_timer
+from .streaming import is_streaming
+from .circuit_breaker import fallback_available
+from ..utils.prometheus_metrics import increment_counter, HEDGED_REQUESTS
+
+# Opt-in hedging between the primary model and the bridge's fall_back. Enabled per
+# bridge with fall_back.hedge = {"is_enable": true, "percentile": 95} (or a fixed
+# "delay_ms"): when the primary has not answered within that percentile of its
+# recent latency, the fall_back is started in parallel and the first successful
+# response wins. The cancelled attempt's cost (including an estimate for the prompt
+# it had in flight) is added to the winner's, and its elapsed time is recorded as a
+# latency sample so a slow model keeps pulling its percentile up.
+
+HEDGE_DEFAULT_DELAY = float(Config.HEDGE_DEFAULT_DELAY)
+HEDGE_MIN_SAMPLES = int(Config.HEDGE_MIN_SAMPLES)
+HEDGE_LATENCY_SAMPLES = int(Config.HEDGE_LATENCY_SAMPLES)
+CHARS_PER_TOKEN = 4  # rough estimate, only used to bill the prompt of a cancelled attempt
+
+_latencies = {}  # (service, model) -> recent execute() durations (successful, or cut short by a hedge)
+
+
+def record_latency(service, model, seconds):
+    samples = _latencies.get((service, model))
+    if samples is None:
+        samples = _latencies[(service, model)] = deque(maxlen=HEDGE_LATENCY_SAMPLES)
+    samples.append(seconds)
+
+
+def hedge_delay(service, model, hedge_config):
+    """Seconds to wait for the primary before starting the hedge."""
+    if hedge_config.get('delay_ms') is not None:
+        return float(hedge_config['delay_ms']) / 1000
+    samples = _latencies.get((service, model))
+    if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+        return HEDGE_DEFAULT_DELAY
+    ordered = sorted(samples)
+    percentile = float(hedge_config.get('percentile') or 95)
+    return ordered[min(int(len(ordered) * percentile / 100), len(ordered) - 1)]
+
+
+def get_hedge_config(parsed_data):
+    """
+    Return the hedge settings if this request may be hedged. Streaming requests
+    and bridges with tools are never hedged: both attempts would write to the same
+    stream, and tool calls (webhooks, agents) would run twice.
+    """
+    fall_back = parsed_data.get('fall_back') or {}
+    hedge_config = fall_back.get('hedge') or {}
+    if not fall_back.get('is_enable') or not hedge_config.get('is_enable'):
+        return None
+    if is_streaming() or parsed_data.get('tools'):
+        return None
+    return hedge_config
+
+
+def build_hedge_data(parsed_data):
+    """Copy of parsed_data pointed at the fall_back model, so both attempts can run side by side."""
+    fallback_config = parsed_data['fall_back']
+    hedge_data = copy.deepcopy(parsed_data)
+    hedge_data['model'] = fallback_config.get('model', parsed_data['model'])
+    hedge_data['service'] = fallback_config.get('service', parsed_data['service'])
+    hedge_data['configuration']['model'] = hedge_data['model']
+    if hedge_data['service'] != parsed_data['service'] or fallback_config.get('apikey'):
+        hedge_data['apikey'] = fallback_config.get('apikey')
+        if hedge_data['apikey'] is None and hedge_data['service'] == 'ai_ml':
+            hedge_data['apikey'] = Config.AI_ML_APIKEY
+    return hedge_data
+
+
+async def _timed_execute(class_obj, has_fallback=True):
+    # Runs in its own task, so this only affects the attempt's own provider calls
+    fallback_available.set(has_fallback)
+    started = time.monotonic()
+    result = await class_obj.execute()
+    return result, time.monotonic() - started
+
+
+def _start(attempt, coroutine):
+    attempt['started'] = time.monotonic()
+    return asyncio.create_task(coroutine)
+
+
+def _succeeded(task):
+    return not task.cancelled() and task.exception() is None and task.result()[0].get('success')
+
+
+def _estimated_prompt_cost(parsed_data):
+    """Input cost of the request an attempt had in flight, estimated from its length."""
+    configuration = parsed_data.get('configuration') or {}
+    text = json.dumps([configuration.get('prompt'), configuration.get('conversation'), parsed_data.get('user')], default=str)
+    pricing = model_config_document[parsed_data['service']][parsed_data['model']]['outputConfig']['usage'][0]['total_cost']
+    return (len(text) // CHARS_PER_TOKEN + 1) / 1_000_000 * (pricing.get('input_cost') or 0)
+
+
+def _loser_cost(attempt, cancelled):
+    """
+    Cost of the losing attempt: the provider calls it completed, plus, if it was
+    cancelled mid-call, the prompt the provider had already received.
+    """
+    parsed_data = attempt['parsed_data']
+    try:
+        cost = attempt['params']['token_calculator'].calculate_total_cost(parsed_data['model'], parsed_data['service'])['total_cost']
+        if cancelled:
+            cost += _estimated_prompt_cost(parsed_data)
+        return cost
+    except Exception as error:
+        logger.error(f"Error calculating hedge loser cost: {str(error)}")
+        return 0
+
+
+async def execute_with_hedge(class_obj, params, parsed_data, timer, hedge_config, prepare_handler):
+    """
+    Execute the primary handler, hedging with the fall_back if it is slow.
+
+    prepare_handler(hedge_data, hedge_timer) must return (class_obj, params) for
+    the fall_back. Returns a dict with the winning result, class_obj, params and
+    parsed_data, plus `fallback_won` and `fallback_tried` flags. If every attempt
+    fails, the primary's failure is returned (or its exception re-raised).
+    """
+    primary = {'class_obj': class_obj, 'params': params, 'parsed_data': parsed_data}
+    primary_task = _start(primary, _timed_execute(class_obj))
+    delay = hedge_delay(parsed_data['service'], parsed_data['model'], hedge_config)
+    await asyncio.wait({primary_task}, timeout=delay)
+
+    if primary_task.done():
+        result, elapsed = primary_task.result()
+        if result.get('success'):
+            record_latency(parsed_data['service'], parsed_data['model'], elapsed)
+        return {**primary, 'result': result, 'fallback_won': False, 'fallback_tried': False}
+
+    try:
+        hedge_data = build_hedge_data(parsed_data)
+        hedge_timer = initialize_timer({'timer': list(timer.getTime())})
+        hedge_class_obj, hedge_params = await prepare_handler(hedge_data, hedge_timer)
+    except Exception as error:
+        fallback_config = parsed_data['fall_back']
+        logger.error(f"Could not start hedge on {fallback_config.get('service', parsed_data['service'])}/{fallback_config.get('model', parsed_data['model'])}: {str(error)}")
+        result, elapsed = await primary_task
+        if result.get('success'):
+            record_latency(parsed_data['service'], parsed_data['model'], elapsed)
+        return {**primary, 'result': result, 'fallback_won': False, 'fallback_tried': False}
+    hedge = {'class_obj': hedge_class_obj, 'params': hedge_params, 'parsed_data': hedge_data}
+    hedge_task = _start(hedge, _timed_execute(hedge_class_obj, has_fallback=False))
+    attempts = {primary_task: primary, hedge_task: hedge}
+
+    winner_task = None
+    pending = set(attempts)
+    try:
+        while pending and winner_task is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner_task = next((task for task in done if _succeeded(task)), None)
+    finally:
+        cancelled_at = time.monotonic()
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    if winner_task is None:
+        increment_counter(HEDGED_REQUESTS, outcome='failed')
+        result, _ = primary_task.result()
+        return {**primary, 'result': result, 'fallback_won': False, 'fallback_tried': True}
+
+    winner = attempts[winner_task]
+    loser_task = hedge_task if winner is primary else primary_task
+    loser = attempts[loser_task]
+    loser_cancelled = loser_task in pending
+    result, elapsed = winner_task.result()
+    record_latency(winner['parsed_data']['service'], winner['parsed_data']['model'], elapsed)
+    if loser_cancelled:
+        # Censored sample: the loser took at least this long, and leaving it out would bias its percentile low
+        record_latency(loser['parsed_data']['service'], loser['parsed_data']['model'], cancelled_at - loser['started'])
+
+    # The losing attempt may already have finished provider calls; bill them at its own pricing
+    winner['params']['token_calculator'].add_external_cost(_loser_cost(loser, loser_cancelled))
+
+    fallback_won = winner is hedge
+    increment_counter(HEDGED_REQUESTS, outcome='fallback' if fallback_won else 'primary')
+    if fallback_won:
+        result['response']['data']['fallback'] = True
+        result['response']['data']['hedged'] = True
+    return {**winner, 'result': result, 'fallback_won': fallback_won, 'fallback_tried': True}
@@ -2,6 +2,10 @@ from openai import AsyncOpenAI
 import traceback
 import copy
 from ..api_executor import execute_api_call
+from ..circuit_breaker import is_connection_error
+from ..sdk_client_pool import get_sdk_client
+from ..streaming import is_streaming, emit_stream_delta, accumulate_chat_completion_stream
+from src.configs.constant import service_name
 # from src.services.utils.unified_token_validator import validate_openai_token_limit
 from globals import *
 
@@ -41,6 +45,24 @@ def remove_duplicate_ids_from_input(configuration):
     return config_copy
 
 
+async def stream_response_model(client, configuration):
+    """Call the Responses API in streaming mode, relaying text deltas, and return the final response dict."""
+    final_response = None
+    stream = await client.responses.create(**configuration, stream=True)
+    async for event in stream:
+        if event.type == 'response.output_text.delta':
+            emit_stream_delta(event.delta)
+        elif event.type in ('response.completed', 'response.incomplete'):
+            final_response = event.response
+        elif event.type == 'response.failed':
+            raise ValueError(str(event.response.error))
+        elif event.type == 'error':
+            raise ValueError(event.message)
+    if final_response is None:
+        raise ValueError("Stream ended without a completed response")
+    return final_response.to_dict()
+
+
 async def openai_test_model(configuration, api_key):
     openAI = AsyncOpenAI(api_key=api_key)
     try:
@@ -59,7 +81,7 @@ async def openai_response_model(configuration, apiKey, execution_time_logs, brid
         # model_name = configuration.get('model')
         # validate_openai_token_limit(configuration, model_name, 'openai_response')
         
-        client = AsyncOpenAI(api_key=apiKey)
+        client = get_sdk_client(service_name['openai'], apiKey)
 
         # Define the API call function with retry mechanism for duplicate ID errors
         async def api_call_with_retry(config, max_retries=2):
@@ -67,6 +89,8 @@ async def openai_response_model(configuration, apiKey, execution_time_logs, brid
             
             for attempt in range(max_retries + 1):
                 try:
+                    if is_streaming():
+                        return {'success': True, 'response': await stream_response_model(client, current_config)}
                     responses = await client.responses.create(**current_config)
                     return {'success': True, 'response': responses.to_dict()}
                 except Exception as error:
@@ -93,7 +117,8 @@ async def openai_response_model(configuration, apiKey, execution_time_logs, brid
                         return {
                             'success': False,
                             'error': error_str,
-                            'status_code': getattr(error, 'status_code', None)
+                            'status_code': getattr(error, 'status_code', None),
+                            'connection_error': is_connection_error(error)
                         }
             
             # This should never be reached, but just in case
@@ -137,18 +162,22 @@ async def openai_response_model(configuration, apiKey, execution_time_logs, brid
 async def openai_completion(configuration, apiKey, execution_time_logs, bridge_id, timer, message_id=None, org_id=None, name = "", org_name= "", service = "", count=0, token_calculator=None):
     try:
         
-        openAI = AsyncOpenAI(api_key=apiKey)
+        openAI = get_sdk_client(service_name['openai'], apiKey)
 
         # Define the API call function
         async def api_call(config):
             try:
+                if is_streaming():
+                    stream = await openAI.chat.completions.create(**config, stream=True, stream_options={'include_usage': True})
+                    return {'success': True, 'response': await accumulate_chat_completion_stream(stream)}
                 chat_completion = await openAI.chat.completions.create(**config)
                 return {'success': True, 'response': chat_completion.to_dict()}
             except Exception as error:
                 return {
                     'success': False,
                     'error': str(error),
-                    'status_code': getattr(error, 'status_code', None)
+                    'status_code': getattr(error, 'status_code', None),
+                    'connection_error': is_connection_error(error)
                 }
 
         # Execute API call with monitoring
@@ -1,6 +1,9 @@
-from openai import AsyncOpenAI
 import traceback
 from ..api_executor import execute_api_call
+from ..circuit_breaker import is_connection_error
+from ..sdk_client_pool import get_sdk_client
+from ..streaming import is_streaming, accumulate_chat_completion_stream
+from src.configs.constant import service_name
 # from src.services.utils.unified_token_validator import validate_openai_token_limit
 from globals import *
 
@@ -11,18 +14,22 @@ async def openrouter_modelrun(configuration, apiKey, execution_time_logs, bridge
         # model_name = configuration.get('model')
         # validate_openai_token_limit(configuration, model_name, service)
         
-        openAI = AsyncOpenAI(base_url="https://openrouter.ai/api/v1", api_key=apiKey)
+        openAI = get_sdk_client(service_name['open_router'], apiKey, base_url="https://openrouter.ai/api/v1")
 
         # Define the API call function
         async def api_call(config):
             try:
+                if is_streaming():
+                    stream = await openAI.chat.completions.create(**config, stream=True, stream_options={'include_usage': True})
+                    return {'success': True, 'response': await accumulate_chat_completion_stream(stream)}
                 chat_completion = await openAI.chat.completions.create(**config)
                 return {'success': True, 'response': chat_completion.to_dict()}
             except Exception as error:
                 return {
                     'success': False,
                     'error': str(error),
-                    'status_code': getattr(error, 'status_code', None)
+                    'status_code': getattr(error, 'status_code', None),
+                    'connection_error': is_connection_error(error)
                 }
 
         # Execute API call with monitoring
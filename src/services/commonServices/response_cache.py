@@ -0,0 +1,45 @@
+import hashlib
+import json
+import time
+import orjson
+from config import Config
+from globals import *
+from src.configs.constant import redis_keys
+from ..cache_service import find_in_cache, store_in_cache
+from ..utils.prometheus_metrics import increment_counter, observe_stage, CACHE_REQUESTS
+
+# Opt-in exact-match cache of provider responses, enabled per bridge with
+# response_cache = {"is_enable": true, "ttl": <seconds>}. Entries are keyed by a
+# hash of the exact payload sent to the provider (resolved prompt, conversation,
+# tools and model parameters), so every tool round is keyed on its own fresh tool
+# results. A hit skips the provider call and therefore adds no token usage.
+
+DEFAULT_RESPONSE_CACHE_TTL = int(Config.RESPONSE_CACHE_TTL)
+
+
+def _canonical(value):
+    return orjson.dumps(value, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+
+
+def response_cache_key(service, configuration, org_id, bridge_id):
+    payload = {'service': service, 'org_id': org_id, 'bridge_id': bridge_id, 'request': configuration}
+    return f"{redis_keys['response_cache_']}{hashlib.sha256(_canonical(payload)).hexdigest()}"
+
+
+async def find_cached_response(cache_key):
+    """Return the cached provider response for cache_key, or None."""
+    start = time.perf_counter()
+    cached = await find_in_cache(cache_key)
+    observe_stage('response_cache_lookup', time.perf_counter() - start)
+    increment_counter(CACHE_REQUESTS, cache='response', result='hit' if cached else 'miss')
+    if not cached:
+        return None
+    try:
+        return json.loads(cached)
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+
+async def store_cached_response(cache_key, response, response_cache):
+    ttl = int(response_cache.get('ttl') or DEFAULT_RESPONSE_CACHE_TTL)
+    await store_in_cache(cache_key, response, ttl)
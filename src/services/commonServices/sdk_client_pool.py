@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from openai import AsyncOpenAI
+from anthropic import AsyncAnthropic
+from groq import AsyncGroq
+from mistralai import Mistral
+from config import Config
+from src.configs.constant import service_name
+from globals import *
+
+# Provider SDK clients each own an httpx connection pool. Building one per call
+# throws that pool away, so clients are cached per process and reused across
+# requests, keyed by (service, sha256(api key), base_url).
+
+MAX_POOLED_CLIENTS = int(Config.SDK_CLIENT_POOL_SIZE)
+CLIENT_IDLE_TTL = int(Config.SDK_CLIENT_IDLE_TTL)
+CLIENT_CLOSE_GRACE = int(Config.SDK_CLIENT_CLOSE_GRACE)
+
+_clients = OrderedDict()  # key -> {'client', 'last_used'}
+_evicted = {}  # evicted client -> TimerHandle of its delayed close
+_pool_loop = None
+
+
+def _build_client(service, api_key, base_url=None):
+    if service == service_name['anthropic']:
+        return AsyncAnthropic(api_key=api_key)
+    if service == service_name['groq']:
+        return AsyncGroq(api_key=api_key)
+    if service == service_name['mistral']:
+        return Mistral(api_key=api_key)
+    if base_url:
+        return AsyncOpenAI(api_key=api_key, base_url=base_url)
+    return AsyncOpenAI(api_key=api_key)
+
+
+async def _close_client(client):
+    _evicted.pop(client, None)
+    try:
+        if isinstance(client, Mistral):
+            await client.__aexit__(None, None, None)
+        else:
+            await client.close()
+    except Exception as error:
+        logger.error(f"Error closing pooled SDK client: {str(error)}")
+
+
+def _evict_idle(now):
+    # Entries are ordered by last use, so idle ones sit at the front.
+    # A request that fetched a dropped client earlier may still be using it, so
+    # its connection pool is closed after CLIENT_CLOSE_GRACE seconds, not at once.
+    while _clients:
+        key, entry = next(iter(_clients.items()))
+        if now - entry['last_used'] < CLIENT_IDLE_TTL and len(_clients) <= MAX_POOLED_CLIENTS:
+            break
+        _clients.popitem(last=False)
+        client = entry['client']
+        _evicted[client] = _pool_loop.call_later(CLIENT_CLOSE_GRACE, lambda client=client: asyncio.ensure_future(_close_client(client)))
+
+
+def get_sdk_client(service, api_key, base_url=None):
+    """
+    Return a pooled async SDK client for the given service and API key.
+
+    Clients are bound to the event loop they were first used on; callers running
+    on a different loop (e.g. through asyncio.run in a worker thread) get a fresh,
+    unpooled client.
+    """
+    global _pool_loop
+    loop = asyncio.get_running_loop()
+    if _pool_loop is None or _pool_loop.is_closed():
+        _clients.clear()
+        _evicted.clear()
+        _pool_loop = loop
+    if _pool_loop is not loop:
+        return _build_client(service, api_key, base_url)
+
+    key = (service, hashlib.sha256((api_key or '').encode('utf-8')).hexdigest(), base_url)
+    now = time.monotonic()
+    entry = _clients.get(key)
+    if entry is None:
+        entry = {'client': _build_client(service, api_key, base_url), 'last_used': now}
+        _clients[key] = entry
+    else:
+        entry['last_used'] = now
+        _clients.move_to_end(key)
+    _evict_idle(now)
+    return entry['client']
+
+
+async def close_sdk_clients():
+    """Close every pooled client. Called from the application lifespan on shutdown."""
+    global _pool_loop
+    clients = [entry['client'] for entry in _clients.values()] + list(_evicted)
+    for handle in _evicted.values():
+        handle.cancel()
+    _clients.clear()
+    _evicted.clear()
+    _pool_loop = None
+    for client in clients:
+        await _close_client(client)
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import time
+import uuid
+import numpy as np
+from collections import OrderedDict
+from config import Config
+from globals import *
+from src.configs.constant import redis_keys
+from ..cache_service import find_in_cache, store_in_cache
+from ..utils.prometheus_metrics import increment_counter, observe_stage, CACHE_REQUESTS
+from .openAI.openai_embedding_model import embedding_model
+
+# Opt-in semantic cache of provider responses, enabled per bridge with
+# semantic_cache = {"is_enable": true, "threshold": 0.92, "ttl": <seconds>}.
+# The user message is embedded and compared (cosine similarity) with earlier
+# questions asked to the same bridge, prompt and model; above the threshold the
+# earlier provider response is served from Redis. Only questions without
+# conversation history or memory are cached, so an answer never depends on
+# another thread's context. The message is embedded with the bridge's own key on
+# openai bridges and with the platform OPENAI_API_KEY otherwise. The vectors live
+# in an in-process index bounded to SEMANTIC_CACHE_MAX_ENTRIES across all bridges,
+# kept per namespace as one numpy matrix so a lookup is a single matrix-vector product.
+
+SEMANTIC_CACHE_MAX_ENTRIES = int(Config.SEMANTIC_CACHE_MAX_ENTRIES)
+SEMANTIC_CACHE_EMBEDDING_MODEL = Config.SEMANTIC_CACHE_EMBEDDING_MODEL
+SEMANTIC_CACHE_EMBEDDING_DIMENSIONS = int(Config.SEMANTIC_CACHE_EMBEDDING_DIMENSIONS)
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+DEFAULT_SEMANTIC_CACHE_TTL = int(Config.RESPONSE_CACHE_TTL)
+
+_entries = OrderedDict()  # cache_key -> (namespace, expires_at), least recently used first
+_namespaces = {}  # namespace -> {'keys': [...], 'vectors': [...], 'matrix': stacked vectors or None}
+
+
+async def _openai_embedder(text, api_key):
+    configuration = {
+        'model': SEMANTIC_CACHE_EMBEDDING_MODEL,
+        'input': text,
+        'dimensions': SEMANTIC_CACHE_EMBEDDING_DIMENSIONS
+    }
+    result = await embedding_model(configuration, api_key or Config.OPENAI_API_KEY)
+    if not result['success']:
+        raise ValueError(result['error'])
+    return result['response']['data'][0]['embedding']
+
+
+_embedder = _openai_embedder
+
+
+def set_embedder(embedder):
+    """Replace the embedder: an async callable (text, api_key) returning a list of floats (e.g. a local model)."""
+    global _embedder
+    _embedder = embedder or _openai_embedder
+
+
+def semantic_namespace(service, model, prompt, org_id, bridge_id):
+    """Questions are only compared with earlier ones sent to the same bridge, prompt and model."""
+    payload = json.dumps([service, model, prompt, org_id, bridge_id], default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _unit_vector(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if not norm:
+        return None
+    return vector / norm
+
+
+def _drop(cache_key):
+    namespace, _ = _entries.pop(cache_key)
+    index = _namespaces.get(namespace)
+    if index is None:
+        return
+    position = index['keys'].index(cache_key)
+    del index['keys'][position]
+    del index['vectors'][position]
+    index['matrix'] = None
+    if not index['keys']:
+        del _namespaces[namespace]
+
+
+def _search(namespace, vector, threshold):
+    """Best live entry at or above threshold; one matrix-vector product per lookup."""
+    index = _namespaces.get(namespace)
+    if index is None:
+        return None
+    if index['matrix'] is None:
+        index['matrix'] = np.vstack(index['vectors'])
+    scores = index['matrix'] @ vector
+    candidates = np.flatnonzero(scores >= threshold)
+    now = time.monotonic()
+    best_key, expired = None, []
+    for position in candidates[np.argsort(-scores[candidates])]:
+        cache_key = index['keys'][position]
+        if _entries[cache_key][1] <= now:
+            expired.append(cache_key)
+            continue
+        best_key = cache_key
+        break
+    for cache_key in expired:
+        _drop(cache_key)
+    if best_key is not None:
+        _entries.move_to_end(best_key)
+    return best_key
+
+
+def _add(namespace, cache_key, vector, ttl):
+    _entries[cache_key] = (namespace, time.monotonic() + ttl)
+    index = _namespaces.setdefault(namespace, {'keys': [], 'vectors': [], 'matrix': None})
+    index['keys'].append(cache_key)
+    index['vectors'].append(vector)
+    index['matrix'] = None
+    while len(_entries) > SEMANTIC_CACHE_MAX_ENTRIES:
+        _drop(next(iter(_entries)))
+
+
+async def _embed(text, api_key):
+    try:
+        return _unit_vector(await _embedder(text, api_key))
+    except Exception as error:
+        logger.error(f"Error embedding message for semantic cache: {str(error)}")
+        return None
+
+
+async def find_semantic_response(namespace, text, semantic_cache, api_key=None):
+    """
+    Return (cached_response, vector). cached_response is None on a miss; vector is
+    the embedded question to pass to store_semantic_response. It is None when the
+    namespace has no entries yet: nothing can match, so the embedding call is left
+    to store_semantic_response, off the request path.
+    """
+    if namespace not in _namespaces:
+        increment_counter(CACHE_REQUESTS, cache='semantic', result='miss')
+        return None, None
+    start = time.perf_counter()
+    vector = await _embed(text, api_key)
+    if vector is None:
+        return None, None
+
+    threshold = float(semantic_cache.get('threshold') or DEFAULT_SIMILARITY_THRESHOLD)
+    cached = None
+    cache_key = _search(namespace, vector, threshold)
+    if cache_key is not None:
+        cached = await find_in_cache(cache_key)
+        if not cached:
+            # Expired or evicted in Redis before the local entry
+            _drop(cache_key)
+    observe_stage('semantic_cache_lookup', time.perf_counter() - start)
+    increment_counter(CACHE_REQUESTS, cache='semantic', result='hit' if cached else 'miss')
+    if not cached:
+        return None, vector
+    try:
+        return json.loads(cached), vector
+    except (json.JSONDecodeError, TypeError):
+        return None, vector
+
+
+async def store_semantic_response(namespace, vector, text, response, semantic_cache, api_key=None):
+    if vector is None:
+        vector = await _embed(text, api_key)
+        if vector is None:
+            return
+    ttl = int(semantic_cache.get('ttl') or DEFAULT_SEMANTIC_CACHE_TTL)
+    cache_key = f"{redis_keys['semantic_cache_']}{uuid.uuid4().hex}"
+    await store_in_cache(cache_key, response, ttl)
+    _add(namespace, cache_key, vector, ttl)
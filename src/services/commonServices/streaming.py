@@ -0,0 +1,146 @@
+import asyncio
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fastapi.responses import JSONResponse
+from globals import *
+
+# Queue of SSE events for the request currently being served with `stream: true`.
+# It is set on the task that runs chat(), so run modules deep in the call stack can
+# relay provider deltas without threading the queue through every signature.
+stream_sink: ContextVar = ContextVar('stream_sink', default=None)
+# Sequence number of the provider call being streamed. A request with tool calls makes
+# several; clients drop the text of a round once a later round starts.
+stream_round: ContextVar = ContextVar('stream_round', default=0)
+
+_STREAM_END = object()
+
+
+def is_streaming() -> bool:
+    return stream_sink.get() is not None
+
+
+def start_stream_round():
+    """Called before each provider call of the streamed request."""
+    if is_streaming():
+        stream_round.set(stream_round.get() + 1)
+
+
+@contextmanager
+def stream_paused():
+    """
+    Hide the stream from nested chats (agents called as tools or transferred to),
+    so only the provider calls of the top-level chat are relayed.
+    """
+    token = stream_sink.set(None)
+    try:
+        yield
+    finally:
+        stream_sink.reset(token)
+
+
+def emit_stream_event(event: dict):
+    queue = stream_sink.get()
+    if queue is not None:
+        queue.put_nowait(event)
+
+
+def emit_stream_delta(text):
+    if text:
+        emit_stream_event({'type': 'delta', 'round': stream_round.get(), 'content': text})
+
+
+def format_sse(event: dict) -> str:
+    return f"data: {json.dumps(event)}\n\n"
+
+
+async def stream_chat_response(chat_fn, request_body):
+    """
+    Run chat_fn(request_body) with a stream sink attached and yield its progress as SSE.
+
+    Provider deltas of the top-level chat are relayed as `delta` events tagged with
+    their `round` while the call is running. Once
+    chat_fn finishes (including background tasks and cost accounting) a single
+    `final` event carries the same payload the non-streaming endpoint returns, which
+    is authoritative if a fallback or post-processing changed the streamed text.
+    """
+    queue = asyncio.Queue()
+
+    async def runner():
+        stream_sink.set(queue)
+        try:
+            return await chat_fn(request_body)
+        finally:
+            queue.put_nowait(_STREAM_END)
+
+    task = asyncio.create_task(runner())
+    try:
+        while True:
+            event = await queue.get()
+            if event is _STREAM_END:
+                break
+            yield format_sse(event)
+
+        result = await task
+        if isinstance(result, JSONResponse):
+            payload = json.loads(result.body)
+            success = result.status_code < 300 and payload.get('success', True)
+        else:
+            payload = result
+            success = True
+        yield format_sse({**payload, 'type': 'final' if success else 'error'})
+    except Exception as error:
+        logger.error(f"Error while streaming chat response: {str(error)}")
+        yield format_sse({'type': 'error', 'success': False, 'error': str(error)})
+    finally:
+        if not task.done():
+            # Client went away; let the chat finish so logs and cost accounting still run
+            task.add_done_callback(_discard_result)
+
+
+def _discard_result(task):
+    if not task.cancelled() and task.exception():
+        logger.error(f"Streamed chat failed after client disconnected: {str(task.exception())}")
+
+
+async def accumulate_chat_completion_stream(stream) -> dict:
+    """
+    Consume an OpenAI-compatible chat.completions stream, relaying content deltas,
+    and rebuild the dict shape of a non-streamed ChatCompletion.to_dict().
+    """
+    response = {'id': '', 'object': 'chat.completion', 'created': 0, 'model': '', 'choices': [], 'usage': None}
+    content = ''
+    tool_calls = {}
+    finish_reason = None
+    role = 'assistant'
+
+    async for chunk in stream:
+        chunk = chunk.to_dict()
+        response['id'] = chunk.get('id') or response['id']
+        response['created'] = chunk.get('created') or response['created']
+        response['model'] = chunk.get('model') or response['model']
+        # Groq reports usage on the last chunk under x_groq instead of usage
+        usage = chunk.get('usage') or (chunk.get('x_groq') or {}).get('usage')
+        if usage:
+            response['usage'] = usage
+        for choice in chunk.get('choices') or []:
+            delta = choice.get('delta') or {}
+            role = delta.get('role') or role
+            if delta.get('content'):
+                content += delta['content']
+                emit_stream_delta(delta['content'])
+            for tool_delta in delta.get('tool_calls') or []:
+                tool_call = tool_calls.setdefault(tool_delta.get('index', 0), {'id': '', 'type': 'function', 'function': {'name': '', 'arguments': ''}})
+                tool_call['id'] = tool_delta.get('id') or tool_call['id']
+                function = tool_delta.get('function') or {}
+                tool_call['function']['name'] += function.get('name') or ''
+                tool_call['function']['arguments'] += function.get('arguments') or ''
+            finish_reason = choice.get('finish_reason') or finish_reason
+
+    message = {'role': role, 'content': content or None}
+    if tool_calls:
+        message['tool_calls'] = [tool_calls[index] for index in sorted(tool_calls)]
+    response['choices'] = [{'index': 0, 'message': message, 'finish_reason': finish_reason}]
+    if response['usage'] is None:
+        response['usage'] = {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+    return response
@@ -1,8 +1,9 @@
 from langchain.text_splitter import RecursiveCharacterTextSplitter, CharacterTextSplitter
 from langchain_experimental.text_splitter import SemanticChunker
 from typing import List, Optional
-from langchain_openai import OpenAIEmbeddings
+import asyncio
 from config import Config
+from .embedding_pipeline import embed_chunks, get_embeddings_client
 
 apikey = Config.OPENAI_API_KEY
 async def manual_chunking(text, chunk_size:int = 1000, chunk_overlap:int =  200):
@@ -30,10 +31,7 @@ async def manual_chunking(text, chunk_size:int = 1000, chunk_overlap:int =  200)
             length_function=len
         )
         chunk_texts = text_splitter.split_text(text)
-        embeddings = []
-        for chunk in chunk_texts:
-            embedding = OpenAIEmbeddings(api_key=apikey).embed_documents([chunk])
-            embeddings.append(embedding)
+        embeddings = await embed_chunks(chunk_texts)
         return chunk_texts, embeddings
     except Exception as e:
         print(f"Error during manual chunking: {str(e)}")
@@ -64,10 +62,7 @@ async def recursive_chunking(text, chunk_size:int = 1000, chunk_overlap:int = 20
         )
         
         chunk_texts = text_splitter.split_text(text)
-        embeddings = []
-        for chunk in chunk_texts:
-            embedding = OpenAIEmbeddings(api_key=apikey).embed_documents([chunk])
-            embeddings.append(embedding)
+        embeddings = await embed_chunks(chunk_texts)
         return chunk_texts, embeddings
     except Exception as e:
         print(f"Error during recursive chunking: {str(e)}")
@@ -88,14 +83,12 @@ async def semantic_chunking(text):
     try:
         if apikey is None:
             raise ValueError("API key is required for semantic chunking")
-        text_splitter = SemanticChunker(OpenAIEmbeddings(api_key = apikey))
-        chunks = text_splitter.create_documents([text])
+        text_splitter = SemanticChunker(get_embeddings_client())
+        # SemanticChunker embeds every sentence synchronously; keep it off the event loop
+        chunks = await asyncio.to_thread(text_splitter.create_documents, [text])
         # Convert Document objects to plain text for better readability
         chunk_texts = [chunk.page_content for chunk in chunks]
-        embeddings = []
-        for chunk in chunk_texts:
-            embedding = OpenAIEmbeddings(api_key=apikey).embed_documents([chunk])
-            embeddings.append(embedding)
+        embeddings = await embed_chunks(chunk_texts)
         return chunk_texts, embeddings
     except Exception as e:
         print(f"Error during semantic chunking: {str(e)}")
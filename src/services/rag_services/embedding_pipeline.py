@@ -0,0 +1,54 @@
+import asyncio
+from typing import List
+from langchain_openai import OpenAIEmbeddings
+from config import Config
+
+# Embeds RAG chunks in batches over one shared client: chunks are grouped into
+# requests of at most RAG_EMBEDDING_BATCH_SIZE inputs and RAG_EMBEDDING_BATCH_TOKENS
+# estimated tokens, and at most RAG_EMBEDDING_CONCURRENCY requests run at a time.
+
+EMBEDDING_BATCH_SIZE = int(Config.RAG_EMBEDDING_BATCH_SIZE)
+EMBEDDING_BATCH_TOKENS = int(Config.RAG_EMBEDDING_BATCH_TOKENS)
+EMBEDDING_CONCURRENCY = int(Config.RAG_EMBEDDING_CONCURRENCY)
+CHARS_PER_TOKEN = 4  # rough estimate, only used to size batches
+
+_embeddings_client = None
+
+
+def get_embeddings_client() -> OpenAIEmbeddings:
+    """Shared OpenAIEmbeddings instance, so its HTTP connections are reused across documents."""
+    global _embeddings_client
+    if _embeddings_client is None:
+        _embeddings_client = OpenAIEmbeddings(api_key=Config.OPENAI_API_KEY)
+    return _embeddings_client
+
+
+def build_batches(chunks: List[str]) -> List[List[str]]:
+    batches = []
+    batch, batch_tokens = [], 0
+    for chunk in chunks:
+        tokens = len(chunk) // CHARS_PER_TOKEN + 1
+        if batch and (len(batch) >= EMBEDDING_BATCH_SIZE or batch_tokens + tokens > EMBEDDING_BATCH_TOKENS):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(chunk)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+async def embed_chunks(chunks: List[str]) -> List[List[List[float]]]:
+    """
+    Embed chunks in order. Each chunk gets a single-vector list ([[...]]), the
+    shape previously produced by embed_documents([chunk]).
+    """
+    client = get_embeddings_client()
+    semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+
+    async def embed_batch(batch):
+        async with semaphore:
+            return await client.aembed_documents(batch)
+
+    results = await asyncio.gather(*(embed_batch(batch) for batch in build_batches(chunks)))
+    return [[vector] for batch_vectors in results for vector in batch_vectors]
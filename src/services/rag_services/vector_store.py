@@ -0,0 +1,112 @@
+import asyncio
+from pymongo.errors import BulkWriteError
+from config import Config
+from globals import *
+
+# Batched writes of RAG chunks to Pinecone and MongoDB. Vectors are upserted and
+# deleted in batches with at most RAG_VECTOR_STORE_CONCURRENCY batches in flight
+# (the Pinecone client is synchronous, so each batch runs in a thread), and the
+# chunk texts go through insert_many / delete_many. Failures are reported per
+# chunk instead of failing the whole document.
+
+VECTOR_UPSERT_BATCH_SIZE = int(Config.RAG_VECTOR_UPSERT_BATCH_SIZE)
+VECTOR_DELETE_BATCH_SIZE = int(Config.RAG_VECTOR_DELETE_BATCH_SIZE)
+VECTOR_STORE_CONCURRENCY = int(Config.RAG_VECTOR_STORE_CONCURRENCY)
+
+
+def _batches(items, size):
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+async def _run_batches(operation, batches):
+    """Run operation(batch) on every batch with bounded concurrency; returns [(batch, error or None)]."""
+    semaphore = asyncio.Semaphore(VECTOR_STORE_CONCURRENCY)
+
+    async def run(batch):
+        async with semaphore:
+            try:
+                await operation(batch)
+                return batch, None
+            except Exception as error:
+                logger.error(f"Vector store batch of {len(batch)} failed: {str(error)}")
+                return batch, error
+
+    return await asyncio.gather(*(run(batch) for batch in batches))
+
+
+async def _insert_chunk_documents(collection, documents):
+    """insert_many in batches; returns {chunk_id: error} for the documents that were not written."""
+    failed = {}
+
+    async def insert(batch):
+        try:
+            await collection.insert_many(batch, ordered=False)
+        except BulkWriteError as error:
+            for write_error in error.details.get('writeErrors', []):
+                failed[batch[write_error['index']]['chunk_id']] = write_error.get('errmsg', 'write error')
+
+    for batch, error in await _run_batches(insert, _batches(documents, VECTOR_UPSERT_BATCH_SIZE)):
+        if error is not None:
+            failed.update({document['chunk_id']: str(error) for document in batch})
+    return failed
+
+
+async def upsert_chunks(index, collection, namespace, vectors, documents):
+    """
+    Upsert vectors ({id, values, metadata}) into the Pinecone index and the
+    matching chunk documents (with a chunk_id) into the Mongo collection.
+
+    Returns {'stored': [chunk_id, ...], 'failed': [{'chunk_id', 'error'}, ...]}.
+    A chunk only counts as stored once both writes succeeded; vectors whose
+    document could not be written are removed again.
+    """
+    failed = {}
+    upserts = await _run_batches(
+        lambda batch: asyncio.to_thread(index.upsert, vectors=batch, namespace=namespace),
+        _batches(vectors, VECTOR_UPSERT_BATCH_SIZE)
+    )
+    for batch, error in upserts:
+        if error is not None:
+            failed.update({vector['id']: str(error) for vector in batch})
+
+    failed.update(await _insert_chunk_documents(
+        collection, [document for document in documents if document['chunk_id'] not in failed]
+    ))
+
+    orphaned = [vector['id'] for vector in vectors if vector['id'] in failed]
+    if orphaned:
+        await delete_chunks(index, None, namespace, orphaned)
+
+    return {
+        'stored': [document['chunk_id'] for document in documents if document['chunk_id'] not in failed],
+        'failed': [{'chunk_id': chunk_id, 'error': error} for chunk_id, error in failed.items()]
+    }
+
+
+async def delete_chunks(index, collection, namespace, chunk_ids):
+    """
+    Delete chunk vectors from the Pinecone index and, if collection is given,
+    their documents from MongoDB. Returns the chunk ids that could not be
+    deleted from either store.
+    """
+    failed = set()
+    deletes = await _run_batches(
+        lambda batch: asyncio.to_thread(index.delete, ids=batch, namespace=namespace),
+        _batches(chunk_ids, VECTOR_DELETE_BATCH_SIZE)
+    )
+    for batch, error in deletes:
+        if error is not None:
+            failed.update(batch)
+
+    if collection is not None:
+        # Keep the text of chunks whose vector is still in the index, so a retry finds both
+        removable = [chunk_id for chunk_id in chunk_ids if chunk_id not in failed]
+        mongo_deletes = await _run_batches(
+            lambda batch: collection.delete_many({'chunk_id': {'$in': batch}}),
+            _batches(removable, VECTOR_DELETE_BATCH_SIZE)
+        )
+        for batch, error in mongo_deletes:
+            if error is not None:
+                failed.update(batch)
+
+    return [chunk_id for chunk_id in chunk_ids if chunk_id in failed]
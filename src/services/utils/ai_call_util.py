@@ -49,6 +49,7 @@ async def call_gtwy_agent(args):
     try:
         # Import inside function to avoid circular imports
         from src.services.commonServices.common import chat
+        from src.services.commonServices.streaming import stream_paused
         request_body = {}
         # Add thread_id and sub_thread_id if provided
         if args.get('thread_id'):
@@ -94,7 +95,9 @@ async def call_gtwy_agent(args):
         }
         
         # Step 5: Call the chat function directly
-        response = await chat(data_to_send)
+        # The agent's answer is a tool result for the caller, not part of the caller's stream
+        with stream_paused():
+            response = await chat(data_to_send)
         
         # Handle JSONResponse object - extract the actual response data
         if hasattr(response, 'body'):
@@ -4,27 +4,182 @@ import certifi
 from io import BytesIO
 import asyncio
 import base64
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+from src.services.utils.prometheus_metrics import increment_counter, CACHE_REQUESTS
+
+# Shared, per-process HTTP client. A single ClientSession keeps a pooled
+# TCPConnector so repeated calls to the same host reuse keep-alive
+# connections instead of paying a fresh TCP + TLS handshake every time.
+_ssl_context = ssl.create_default_context(cafile=certifi.where())
+_session = None
+_session_loop = None
+
+def _build_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        ssl=_ssl_context,
+        limit=int(Config.HTTP_POOL_LIMIT),
+        limit_per_host=int(Config.HTTP_POOL_LIMIT_PER_HOST),
+        keepalive_timeout=float(Config.HTTP_KEEPALIVE_TIMEOUT),
+        ttl_dns_cache=int(Config.HTTP_DNS_CACHE_TTL),
+        enable_cleanup_closed=True,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=float(Config.HTTP_TOTAL_TIMEOUT),
+        sock_connect=float(Config.HTTP_CONNECT_TIMEOUT),
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+def get_http_session():
+    """
+    Return the shared session, creating it lazily on the main thread's event loop.
+
+    Returns None on any other loop (e.g. code executed through asyncio.run in a
+    worker thread), in which case the caller should fall back to a short-lived
+    session. Only the main loop gets a shared session, so the one session closed
+    by the lifespan on shutdown is the only one ever opened.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop.is_closed():
+        if threading.current_thread() is not threading.main_thread():
+            return None
+        _session = _build_session()
+        _session_loop = loop
+    if _session_loop is not loop:
+        return None
+    return _session
+
+async def close_http_session():
+    """Close the shared session. Called from the application lifespan on shutdown."""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+async def _read_response(response, image):
+    # Extract the response body and headers
+    if response.status >= 300:
+        error_response = await response.text()
+        raise  ValueError(error_response)
+    if image:
+        response_data = BytesIO(await response.read())
+    else:
+        response_data = await response.json()  # This gets the body as text (could also use .json() for JSON)
+    response_headers = dict(response.headers)   # This gets the response headers
+    return response_data, response_headers
+
+async def _request(read, url, method, headers, params, json_body):
+    session = get_http_session()
+    if session is None:
+        async with aiohttp.ClientSession() as local_session:
+            async with local_session.request(method=method, url=url, headers=headers, params=params, json=json_body, ssl=_ssl_context) as response:
+                return await read(response)
+
+    async with session.request(method=method, url=url, headers=headers, params=params, json=json_body) as response:
+        return await read(response)
 
 async def fetch(url, method="GET", headers=None, params=None, json_body=None, image=None):
-    ssl_context = ssl.create_default_context(cafile=certifi.where())
+    return await _request(lambda response: _read_response(response, image), url, method, headers, params, json_body)
 
-    async with aiohttp.ClientSession() as session:
-        async with session.request(method=method, url=url, headers=headers, params=params, json=json_body, ssl=ssl_context) as response:
-            # Extract the response body and headers
+async def _read_bytes(response):
+    if response.status >= 300:
+        raise ValueError(await response.text())
+    return await response.read(), dict(response.headers)
+
+async def fetch_bytes(url, method="GET", headers=None, params=None, json_body=None):
+    """Like fetch, but returns the raw response body as bytes, whatever its content type."""
+    return await _request(_read_bytes, url, method, headers, params, json_body)
+
+# Per-process cache of base64-encoded media, so images in a conversation are not
+# downloaded and encoded again on every turn. Entries are revalidated with their
+# ETag / Last-Modified once MEDIA_CACHE_REVALIDATE_SECONDS old, and evicted least
+# recently used first once the cache holds MEDIA_CACHE_MAX_BYTES of encoded data.
+MEDIA_CACHE_MAX_BYTES = int(Config.MEDIA_CACHE_MAX_BYTES)
+MEDIA_CACHE_MAX_ITEM_BYTES = int(Config.MEDIA_CACHE_MAX_ITEM_BYTES)
+MEDIA_CACHE_REVALIDATE_SECONDS = float(Config.MEDIA_CACHE_REVALIDATE_SECONDS)
+
+_media_cache = OrderedDict()  # url -> {data, media_type, etag, last_modified, validated_at}
+_media_cache_bytes = 0
+_media_cache_lock = threading.Lock()  # conversations can also be built on worker-thread event loops
+_media_inflight = {}  # (event loop, url) -> task downloading it
+
+def _get_cached_media(url):
+    with _media_cache_lock:
+        entry = _media_cache.get(url)
+        if entry is not None:
+            _media_cache.move_to_end(url)
+        return entry
+
+def _store_cached_media(url, entry):
+    global _media_cache_bytes
+    size = len(entry['data'])
+    if size > MEDIA_CACHE_MAX_ITEM_BYTES:
+        return
+    with _media_cache_lock:
+        previous = _media_cache.pop(url, None)
+        if previous is not None:
+            _media_cache_bytes -= len(previous['data'])
+        _media_cache[url] = entry
+        _media_cache_bytes += size
+        while _media_cache_bytes > MEDIA_CACHE_MAX_BYTES and _media_cache:
+            _, evicted = _media_cache.popitem(last=False)
+            _media_cache_bytes -= len(evicted['data'])
+
+async def _request_media(session, url, cached, **kwargs):
+    headers = {}
+    if cached and cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    if cached and cached.get('last_modified'):
+        headers['If-Modified-Since'] = cached['last_modified']
+    async with session.get(url, headers=headers or None, **kwargs) as response:
+        if response.status == 304 and cached:
+            increment_counter(CACHE_REQUESTS, cache='media', result='revalidated')
+            entry = {**cached, 'validated_at': time.monotonic()}
+        else:
             if response.status >= 300:
-                error_response = await response.text()
-                raise  ValueError(error_response)
-            if image:
-                response_data = BytesIO(await response.read())
-            else:
-                response_data = await response.json()  # This gets the body as text (could also use .json() for JSON)
-            response_headers = dict(response.headers)   # This gets the response headers
-            return response_data, response_headers
+                raise ValueError(await response.text())
+            increment_counter(CACHE_REQUESTS, cache='media', result='miss')
+            entry = {
+                'data': base64.b64encode(await response.read()).decode('utf-8'),
+                'media_type': response.headers.get('Content-Type'),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'validated_at': time.monotonic(),
+            }
+    _store_cached_media(url, entry)
+    return entry
+
+async def _download_media(url, cached):
+    session = get_http_session()
+    if session is None:
+        async with aiohttp.ClientSession() as local_session:
+            return await _request_media(local_session, url, cached, ssl=_ssl_context)
+    return await _request_media(session, url, cached)
+
+async def fetch_media_b64(url):
+    """
+    Return {'data': base64 body, 'media_type': Content-Type, ...} for url, from the
+    media cache when possible. Concurrent requests for the same url on one event
+    loop share a single download.
+    """
+    cached = _get_cached_media(url)
+    if cached is not None and time.monotonic() - cached['validated_at'] < MEDIA_CACHE_REVALIDATE_SECONDS:
+        increment_counter(CACHE_REQUESTS, cache='media', result='hit')
+        return cached
+    key = (asyncio.get_running_loop(), url)
+    task = _media_inflight.get(key)
+    if task is None:
+        task = _media_inflight[key] = asyncio.ensure_future(_download_media(url, cached))
+        task.add_done_callback(lambda _: _media_inflight.pop(key, None))
+    # Shielded so one caller giving up does not cancel the download for the others
+    return await asyncio.shield(task)
 
 async def fetch_images_b64(urls):
     if not urls:
         return []
-    images_res, headers = zip(*await asyncio.gather(*(fetch(url, image=True) for url in urls)))
-    images_data = [base64.b64encode(image.getvalue()).decode('utf-8') for image in images_res]
-    images_media_type = [header.get('Content-Type') for header in headers]
-    return zip(images_data, images_media_type)
+    images = await asyncio.gather(*(fetch_media_b64(url) for url in urls))
+    return [(image['data'], image['media_type']) for image in images]
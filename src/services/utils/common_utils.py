@@ -29,6 +29,7 @@ from src.services.cache_service import find_in_cache, store_in_cache, client, RE
 from src.services.utils.update_and_check_cost import update_cost,update_last_used
 from ..commonServices.baseService.utils import sendResponse
 from src.services.utils.rich_text_support import process_chatbot_response
+from src.services.commonServices.streaming import stream_paused
 from src.db_services.orchestrator_history_service import orchestrator_collector
 
 def setup_agent_pre_tools(parsed_data, bridge_configurations):
@@ -115,8 +116,9 @@ async def handle_agent_transfer(result, request_body, bridge_configurations, cha
         'path_params': request_body.get('path_params', {})
     }
     
-    # Call chat function with the transfer agent's data
-    transfer_result = await chat_function(transfer_request_body)
+    # Call chat function with the transfer agent's data; its answer arrives in the final event
+    with stream_paused():
+        transfer_result = await chat_function(transfer_request_body)
     
     return transfer_result
 
@@ -181,6 +183,8 @@ def parse_request_body(request_body):
         "thread_flag" : body.get('thread_flag') or False,
         "files" : body.get('files') or [],
         "fall_back" : body.get('fall_back') or {},
+        "response_cache" : body.get('response_cache') or {},
+        "semantic_cache" : body.get('semantic_cache') or {},
         "guardrails" : body.get('bridges', {}).get('guardrails') or {},
         "testcase_data" : body.get('testcase_data') or {},
         "is_embed" : body.get('is_embed'),
@@ -431,7 +435,9 @@ def build_service_params(parsed_data, custom_config, model_output_config, thread
         "web_search_filters" : parsed_data['web_search_filters'],
         "folder_id": parsed_data.get('folder_id'),
         "bridge_configurations": bridge_configurations,
-        "owner_id" : parsed_data.get('owner_id')
+        "owner_id" : parsed_data.get('owner_id'),
+        "response_cache": parsed_data.get('response_cache') or {},
+        "semantic_cache": parsed_data.get('semantic_cache') or {}
 
     }
 
@@ -0,0 +1,55 @@
+import io
+import signal
+import PyPDF2
+import docx
+import pandas as pd
+
+# Synchronous document parsers, run in the RAG parser process pool (see
+# rag_utils.py). Keep this module free of application imports: every pool
+# worker imports it on start.
+
+
+class ParseTimeoutError(Exception):
+    pass
+
+
+def run_with_timeout(parser, data: bytes, timeout: float):
+    """
+    Run parser(data) in the pool worker, raising ParseTimeoutError once it has
+    run for timeout seconds. The clock starts when the worker picks the file up,
+    and only this parse is interrupted; the worker stays usable.
+    """
+    def on_alarm(signum, frame):
+        raise ParseTimeoutError(f"Parsing took longer than {timeout} seconds")
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return parser(data)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def parse_pdf(data: bytes) -> str:
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+    text = ""
+    for page in pdf_reader.pages:
+        text += page.extract_text()
+    return text
+
+
+def parse_docx(data: bytes) -> str:
+    doc = docx.Document(io.BytesIO(data))
+    text = ""
+    for para in doc.paragraphs:
+        text += para.text + "\n"
+    return text
+
+
+def parse_csv(data: bytes) -> list:
+    df = pd.read_csv(io.BytesIO(data))
+    def row_to_string(row):
+        return ', '.join([f"{col}: {value}" for col, value in row.items()])
+
+    return df.apply(row_to_string, axis=1).tolist()
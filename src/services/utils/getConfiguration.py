@@ -172,6 +172,8 @@ async def _prepare_configuration_response(configuration, service, bridge_id, api
         'variables_state': result.get('bridges', {}).get('variables_state', {}),
         'built_in_tools': built_in_tools or result.get('bridges', {}).get('built_in_tools'),
         'fall_back': result.get('bridges', {}).get('fall_back') or {},
+        'response_cache': result.get('bridges', {}).get('response_cache') or {},
+        'semantic_cache': result.get('bridges', {}).get('semantic_cache') or {},
         'guardrails': guardrails_value,
         "is_embed": result.get('bridges', {}).get("folder_type") == 'embed',
         "user_id": result.get("bridges", {}).get("user_id"),
@@ -24,6 +24,9 @@ async def validate_bridge(bridge_data, result):
 
 async def get_bridge_data(bridge_id, org_id, version_id):
     """Fetch bridge data from database"""
+    if bridge_id and version_id:
+        # Both cache entries are read below, fetch them in one round-trip
+        await ConfigurationService.prefetch_bridge_caches(bridge_id, version_id)
     result = await ConfigurationService.get_bridges_with_tools_and_apikeys(
         bridge_id=bridge_id, 
         org_id=org_id, 
@@ -42,6 +42,20 @@ def validate_fall_back(fall_back_data):
         if model not in model_config_document[service]:
             raise HTTPException(status_code=400, detail=f"fall_back model '{model}' is not available for service '{service}'")
     
+    # Optional hedging settings
+    hedge = fall_back_data.get('hedge')
+    if hedge is not None:
+        if not isinstance(hedge, dict):
+            raise HTTPException(status_code=400, detail="fall_back.hedge must be a dictionary")
+        if not isinstance(hedge.get('is_enable', False), bool):
+            raise HTTPException(status_code=400, detail="fall_back.hedge.is_enable must be a boolean")
+        percentile = hedge.get('percentile')
+        if percentile is not None and (not isinstance(percentile, (int, float)) or not 0 < percentile < 100):
+            raise HTTPException(status_code=400, detail="fall_back.hedge.percentile must be a number between 0 and 100")
+        delay_ms = hedge.get('delay_ms')
+        if delay_ms is not None and (not isinstance(delay_ms, (int, float)) or delay_ms < 0):
+            raise HTTPException(status_code=400, detail="fall_back.hedge.delay_ms must be a non-negative number")
+    
     return True
 
 async def get_default_values_controller(service, model, current_configuration, type):
@@ -2,11 +2,19 @@
 Guardrails validation system using OpenAI gpt-5-nano model with multiple template categories
 """
 import json
+import hashlib
 import traceback
-from openai import AsyncOpenAI
+from functools import lru_cache
 from globals import logger
 from exceptions.bad_request import BadRequestException
 from config import Config
+from src.configs.constant import redis_keys, service_name
+from src.services.cache_service import find_in_cache, store_in_cache
+from src.services.utils.prometheus_metrics import increment_counter, CACHE_REQUESTS
+from src.services.commonServices.streaming import is_streaming
+from src.services.commonServices.sdk_client_pool import get_sdk_client
+
+GUARDRAILS_VERDICT_TTL = int(Config.GUARDRAILS_VERDICT_TTL)
 
 
 # Guardrails template definitions
@@ -125,9 +133,61 @@ GUARDRAILS_TEMPLATES = {
 }
 
 
+def get_active_categories(guardrails_config: dict = None) -> tuple:
+    """Enabled guardrail categories in template order; all of them if none is enabled."""
+    active_categories = tuple(
+        category for category in GUARDRAILS_TEMPLATES
+        if guardrails_config and guardrails_config.get(category)
+    )
+    return active_categories or tuple(GUARDRAILS_TEMPLATES.keys())
+
+
+@lru_cache(maxsize=256)
+def build_guardrails_prompt(active_categories: tuple, custom_prompt: str = None) -> str:
+    """Build (once per category set and custom prompt) the developer prompt for the guardrails model."""
+    category_prompts = []
+    category_names = []
+    for category in active_categories:
+        template = GUARDRAILS_TEMPLATES[category]
+        category_names.append(template["name"])
+        category_prompts.append(f"**{template['name']}**: {template['prompt']}")
+    
+    base_prompt = f"""You are a content moderation system. Your job is to analyze user messages for specific safety violations.
+
+Analyze the following user message for these specific categories:
+
+{chr(10).join(category_prompts)}
+
+Respond with ONLY a JSON object in this exact format:
+{{
+    "is_safe": true/false,
+    "reason": "Brief explanation of why the content is safe or unsafe",
+    "confidence": 0.95,
+    "violations": ["category1", "category2"]  // List category names that were violated, empty array if safe
+}}
+
+If the content is safe and appropriate for ALL categories, set is_safe to true and violations to [].
+If the content violates ANY category, set is_safe to false, list the violated categories, and explain why.
+Confidence should be between 0.0 and 1.0.
+
+Active categories being checked: {', '.join(category_names)}"""
+
+    # Append custom prompt if provided
+    if custom_prompt:
+        base_prompt += f"\n\nAdditional custom guidelines:\n{custom_prompt}"
+    return base_prompt
+
+
+def guardrails_verdict_key(active_categories: tuple, custom_prompt: str, user_message: str) -> str:
+    payload = json.dumps([list(active_categories), custom_prompt or "", user_message or ""])
+    return f"{redis_keys['guardrails_verdict_']}{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
 async def validate_with_guardrails(user_message: str, api_key: str, guardrails_config: dict = None, custom_prompt: str = None) -> dict:
     """
-    Validate user message using OpenAI gpt-5-nano model for guardrails checking
+    Validate user message using OpenAI gpt-5-nano model for guardrails checking.
+    Verdicts are cached for GUARDRAILS_VERDICT_TTL seconds by category set,
+    custom prompt and message.
     
     Args:
         user_message (str): The user's message to validate
@@ -145,48 +205,15 @@ async def validate_with_guardrails(user_message: str, api_key: str, guardrails_c
         }
     """
     try:
-        # Build dynamic guardrails prompt based on configuration
-        active_categories = []
-        if guardrails_config:
-            for category, enabled in guardrails_config.items():
-                if enabled and category in GUARDRAILS_TEMPLATES:
-                    active_categories.append(category)
-        
-        # If no specific categories provided, use all categories
-        if not active_categories:
-            active_categories = list(GUARDRAILS_TEMPLATES.keys())
-        
-        # Build the prompt with active categories
-        category_prompts = []
-        category_names = []
-        for category in active_categories:
-            template = GUARDRAILS_TEMPLATES[category]
-            category_names.append(template["name"])
-            category_prompts.append(f"**{template['name']}**: {template['prompt']}")
-        
-        base_prompt = f"""You are a content moderation system. Your job is to analyze user messages for specific safety violations.
-
-Analyze the following user message for these specific categories:
-
-{chr(10).join(category_prompts)}
-
-Respond with ONLY a JSON object in this exact format:
-{{
-    "is_safe": true/false,
-    "reason": "Brief explanation of why the content is safe or unsafe",
-    "confidence": 0.95,
-    "violations": ["category1", "category2"]  // List category names that were violated, empty array if safe
-}}
+        active_categories = get_active_categories(guardrails_config)
 
-If the content is safe and appropriate for ALL categories, set is_safe to true and violations to [].
-If the content violates ANY category, set is_safe to false, list the violated categories, and explain why.
-Confidence should be between 0.0 and 1.0.
+        verdict_key = guardrails_verdict_key(active_categories, custom_prompt, user_message)
+        cached_verdict = await find_in_cache(verdict_key)
+        increment_counter(CACHE_REQUESTS, cache='guardrails', result='hit' if cached_verdict else 'miss')
+        if cached_verdict:
+            return json.loads(cached_verdict)
 
-Active categories being checked: {', '.join(category_names)}"""
-
-        # Append custom prompt if provided
-        if custom_prompt:
-            base_prompt += f"\n\nAdditional custom guidelines:\n{custom_prompt}"
+        base_prompt = build_guardrails_prompt(active_categories, custom_prompt or None)
 
         # Prepare the messages for OpenAI
         messages = [
@@ -200,11 +227,8 @@ Active categories being checked: {', '.join(category_names)}"""
             }
         ]
 
-        # Initialize OpenAI client
-        client = AsyncOpenAI(api_key=api_key)
-
         # Call OpenAI gpt-5-nano model
-        response = await client.chat.completions.create(
+        response = await get_sdk_client(service_name['openai'], api_key).chat.completions.create(
             model="gpt-5-nano",
             messages=messages,
             response_format={"type": "json_object"}
@@ -229,6 +253,8 @@ Active categories being checked: {', '.join(category_names)}"""
         if 'violations' not in result:
             result['violations'] = []
         
+        # Only real verdicts are cached; the fallbacks below must not outlive the error
+        await store_in_cache(verdict_key, result, GUARDRAILS_VERDICT_TTL)
         return result
 
     except json.JSONDecodeError as e:
@@ -253,6 +279,19 @@ Active categories being checked: {', '.join(category_names)}"""
         }
 
 
+def is_optimistic_guardrails(parsed_data: dict) -> bool:
+    """
+    Whether the guardrails check may run concurrently with the main provider call
+    (guardrails.optimistic). Streaming requests and bridges with tools, pre_tools,
+    RAG documents or built-in tools always run it first: streamed text and anything
+    sent to a tool, pre-function or retriever cannot be taken back if the check fails.
+    """
+    guardrails = parsed_data.get('guardrails', {})
+    if not guardrails.get('optimistic') or is_streaming():
+        return False
+    return not any(parsed_data.get(key) for key in ('tools', 'pre_tools', 'rag_data', 'doc_ids', 'built_in_tools'))
+
+
 async def guardrails_check(parsed_data: dict) -> dict:
     """
     Check if guardrails validation should be performed and execute if needed
@@ -6,7 +6,7 @@ import json
 from config import Config
 from Crypto.Util.Padding import unpad
 import traceback    
-from functools import reduce
+from functools import reduce, lru_cache
 import operator
 import re
 from src.configs.model_configuration import model_config_document
@@ -33,6 +33,10 @@ from ..commonServices.baseService.utils import sendResponse
 from datetime import datetime
 import pytz
 from src.configs.constant import redis_keys
+
+PLACEHOLDER_PATTERN = re.compile(r'\{\{(.*?)\}\}')
+
+
 class Helper:
     @staticmethod
     def encrypt(text):
@@ -108,22 +112,62 @@ class Helper:
             del prev_configuration["tools"]
         return prev_configuration
 
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def compile_prompt_template(prompt):
+        """
+        Parse a prompt once into segments: even indexes are literal text, odd
+        indexes are placeholder names (the text between {{ and }}).
+        """
+        return tuple(PLACEHOLDER_PATTERN.split(prompt))
+
     @staticmethod
     def replace_variables_in_prompt(prompt, Aviliable_variables):
         missing_variables = {}
-        placeholders = re.findall(r'\{\{(.*?)\}\}', prompt)
+        segments = Helper.compile_prompt_template(prompt)
+        if len(segments) == 1:
+            return prompt, missing_variables
         flattened_json = Helper.custom_flatten(Aviliable_variables)
         variables = {**Aviliable_variables, **flattened_json}
 
-        if variables:
-            for key, value in variables.items():
-                if key in placeholders:
-                    string_value = str(value)
-                    string_value = string_value[1:-1] if string_value.startswith('"') and string_value.endswith('"') else string_value
-                    string_value = string_value.replace("\\", "\\\\")
-                    regex = re.compile(r'\{\{' + re.escape(key) + r'\}\}')
-                    prompt = regex.sub(string_value, prompt)
-                    placeholders.remove(key)
+        rendered = [segments[0]]
+        substituted = set()
+        for index in range(1, len(segments), 2):
+            placeholder = segments[index]
+            if placeholder in variables:
+                string_value = str(variables[placeholder])
+                string_value = string_value[1:-1] if string_value.startswith('"') and string_value.endswith('"') else string_value
+                if '{' in string_value or '}' in string_value:
+                    # The value can hold (or complete) another placeholder, substitute key by key
+                    return Helper.replace_variables_one_by_one(prompt, variables, list(segments[1::2]))
+                rendered.append(string_value)
+                # As before, a repeated placeholder is substituted everywhere but reported missing after its first occurrence
+                if placeholder in substituted:
+                    missing_variables[placeholder] = f"{{{{{placeholder}}}}}"
+                substituted.add(placeholder)
+            else:
+                rendered.append(f"{{{{{placeholder}}}}}")
+                missing_variables[placeholder] = f"{{{{{placeholder}}}}}"
+            rendered.append(segments[index + 1])
+
+        return ''.join(rendered), missing_variables
+
+    @staticmethod
+    def replace_variables_one_by_one(prompt, variables, placeholders):
+        """
+        Substitute each variable over the whole prompt in turn, so placeholders that
+        appear inside earlier substituted values are filled in as well, e.g.
+        {"a": "{{b}}", "b": "x"} renders "{{a}} and {{b}}" as "x and x".
+        """
+        missing_variables = {}
+        for key, value in variables.items():
+            if key in placeholders:
+                string_value = str(value)
+                string_value = string_value[1:-1] if string_value.startswith('"') and string_value.endswith('"') else string_value
+                string_value = string_value.replace("\\", "\\\\")
+                regex = re.compile(r'\{\{' + re.escape(key) + r'\}\}')
+                prompt = regex.sub(string_value, prompt)
+                placeholders.remove(key)
 
         for placeholder in placeholders:
             missing_variables[placeholder] = f"{{{{{placeholder}}}}}"
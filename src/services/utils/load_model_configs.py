@@ -3,16 +3,26 @@ from globals import *
 
 modelConfigModel = db["modelconfigurations"]
 
+def format_model_configuration(conf):
+    """Strip Mongo ids from a model configuration document."""
+    conf_dict = dict(conf)
+    conf_dict.pop('_id', None)
+    if 'outputConfig' in conf_dict:
+        if '_id' in conf_dict['outputConfig']['usage'][0]:
+            del conf_dict['outputConfig']['usage'][0]['_id']
+    return conf_dict
+
+async def get_model_configuration_documents():
+    """Fetch raw model configuration documents, including _id. Errors are raised to the caller."""
+    return await modelConfigModel.find({}).to_list(length=None)
+
 async def get_model_configurations():
     try:
         # Remove the projection to allow _id to be included in the results
         configurations = await modelConfigModel.find({}, {"_id": 0}).to_list(length=None)
         config_dict = {}
         for conf in configurations:
-            conf_dict = dict(conf)     
-            if 'outputConfig' in conf_dict:
-                if '_id' in conf_dict['outputConfig']['usage'][0]:
-                    del conf_dict['outputConfig']['usage'][0]['_id']
+            conf = format_model_configuration(conf)
             if config_dict.get(conf['service']) is None: 
                 config_dict[conf['service']] = {}
             config_dict[conf['service']][conf['model_name']] = conf
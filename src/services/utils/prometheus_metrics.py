@@ -0,0 +1,141 @@
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from config import Config
+from globals import *
+
+# Prometheus metrics for the chat pipeline, exported from /metrics without an
+# external collector. Every gunicorn worker aggregates observations in memory
+# and periodically adds them into one Redis hash with HINCRBYFLOAT, so a scrape
+# hitting any worker sees the totals of all of them.
+
+METRICS_FLUSH_INTERVAL = float(Config.PROMETHEUS_FLUSH_INTERVAL)
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+STAGE_DURATION = 'gtwy_chat_stage_duration_seconds'
+PROVIDER_ERRORS = 'gtwy_provider_errors_total'
+FALLBACKS = 'gtwy_fallbacks_total'
+CACHE_REQUESTS = 'gtwy_cache_requests_total'
+CIRCUIT_BREAKER_REJECTIONS = 'gtwy_circuit_breaker_rejections_total'
+HEDGED_REQUESTS = 'gtwy_hedged_requests_total'
+
+METRIC_DEFINITIONS = {
+    STAGE_DURATION: ('histogram', 'Time spent in each stage of a chat request.'),
+    PROVIDER_ERRORS: ('counter', 'Failed provider API calls.'),
+    FALLBACKS: ('counter', 'Requests retried on the fallback model after the primary call failed.'),
+    CACHE_REQUESTS: ('counter', 'Cache lookups by cache tier and result.'),
+    CIRCUIT_BREAKER_REJECTIONS: ('counter', 'Provider calls failed fast because the circuit breaker was open.'),
+    HEDGED_REQUESTS: ('counter', 'Requests where the fall_back was started in parallel, by which attempt won.'),
+}
+
+_pending = {}  # json [metric, labels] -> value accumulated since the last flush
+_pending_lock = threading.Lock()  # observations can arrive from worker-thread event loops
+
+
+def _redis_key():
+    from src.services.cache_service import REDIS_PREFIX
+    return f"{REDIS_PREFIX}prometheus_metrics"
+
+
+def _add(metric, labels, value):
+    field = json.dumps([metric, labels], sort_keys=True)
+    with _pending_lock:
+        _pending[field] = _pending.get(field, 0) + value
+
+
+def observe_stage(stage, seconds, **labels):
+    """Record the duration of a chat stage in the stage histogram."""
+    labels = {'stage': stage, **{key: str(value) for key, value in labels.items()}}
+    for bound in STAGE_BUCKETS:
+        if seconds <= bound:
+            _add(f"{STAGE_DURATION}_bucket", {**labels, 'le': str(bound)}, 1)
+    _add(f"{STAGE_DURATION}_bucket", {**labels, 'le': '+Inf'}, 1)
+    _add(f"{STAGE_DURATION}_sum", labels, seconds)
+    _add(f"{STAGE_DURATION}_count", labels, 1)
+
+
+@contextmanager
+def stage_timer(stage, **labels):
+    """Time the enclosed block as the given chat stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start, **labels)
+
+
+def increment_counter(metric, amount=1, **labels):
+    _add(metric, {key: str(value) for key, value in labels.items()}, amount)
+
+
+async def flush_metrics():
+    """Add this worker's pending observations to the shared Redis hash."""
+    from src.services.cache_service import client
+    with _pending_lock:
+        pending = dict(_pending)
+        _pending.clear()
+    if not pending:
+        return
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for field, value in pending.items():
+                pipe.hincrbyfloat(_redis_key(), field, value)
+            await pipe.execute()
+    except Exception as error:
+        logger.error(f"Error flushing prometheus metrics: {str(error)}")
+        # Keep the observations for the next attempt
+        with _pending_lock:
+            for field, value in pending.items():
+                _pending[field] = _pending.get(field, 0) + value
+
+
+async def export_metrics_periodically():
+    """Background task flushing pending observations every PROMETHEUS_FLUSH_INTERVAL seconds."""
+    while True:
+        try:
+            await asyncio.sleep(METRICS_FLUSH_INTERVAL)
+            await flush_metrics()
+        except asyncio.CancelledError:
+            await flush_metrics()
+            raise
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _sort_key(series):
+    metric, labels, _ = series
+    le = labels.get('le')
+    bound = float('inf') if le in (None, '+Inf') else float(le)
+    return sorted((key, value) for key, value in labels.items() if key != 'le'), metric, bound
+
+
+async def render_metrics() -> str:
+    """Build the Prometheus text exposition of the metrics aggregated across workers."""
+    from src.services.cache_service import client
+    await flush_metrics()
+    stored = await client.hgetall(_redis_key())
+
+    families = {}
+    for field, value in stored.items():
+        metric, labels = json.loads(field)
+        family = next((name for name in METRIC_DEFINITIONS if metric.startswith(name)), metric)
+        families.setdefault(family, []).append((metric, labels, value))
+
+    lines = []
+    for family in sorted(families):
+        metric_type, description = METRIC_DEFINITIONS.get(family, ('untyped', ''))
+        lines.append(f"# HELP {family} {description}")
+        lines.append(f"# TYPE {family} {metric_type}")
+        for metric, labels, value in sorted(families[family], key=_sort_key):
+            label_text = ','.join(f'{key}="{_escape(labels[key])}"' for key in sorted(labels, key=lambda key: (key == 'le', key)))
+            lines.append(f"{metric}{{{label_text}}} {_format_value(value)}" if label_text else f"{metric} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
@@ -1,35 +1,94 @@
-import io
-import PyPDF2
-import docx
-import pandas as pd
-from fastapi import UploadFile, File
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import UploadFile, File, HTTPException
 import json
+from config import Config
+from globals import *
 from .ai_call_util import call_ai_middleware
+from .document_parsers import parse_pdf, parse_docx, parse_csv, run_with_timeout, ParseTimeoutError
 from src.configs.constant import bridge_ids
 
+# Uploaded documents are parsed in a small process pool instead of on the event
+# loop, so ingesting a large PDF does not stall the chat requests served by the
+# same worker. Files above RAG_MAX_FILE_BYTES are rejected, and a parse running
+# longer than RAG_PARSE_TIMEOUT seconds (counted from when a worker starts it) is
+# interrupted inside its worker. Only a parse that ignores the interrupt (stuck in
+# native code) gets its pool killed, after a short grace period.
+RAG_PARSER_WORKERS = int(Config.RAG_PARSER_WORKERS)
+RAG_MAX_FILE_BYTES = int(Config.RAG_MAX_FILE_BYTES)
+RAG_PARSE_TIMEOUT = float(Config.RAG_PARSE_TIMEOUT)
+RAG_PARSE_KILL_GRACE = 5
+
+_parser_pool = None
+_parse_slots = asyncio.Semaphore(RAG_PARSER_WORKERS)  # one per worker, so no submitted parse waits in the pool queue
+
+def _get_parser_pool() -> ProcessPoolExecutor:
+    global _parser_pool
+    if _parser_pool is None:
+        # spawn: the workers only import document_parsers, never a copy of the app process
+        _parser_pool = ProcessPoolExecutor(max_workers=RAG_PARSER_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+    return _parser_pool
+
+def shutdown_parser_pool(pool=None, kill=False):
+    """
+    Stop a parser pool (the current one by default; called on shutdown); kill=True
+    also terminates parses still running. A later request gets a fresh pool.
+    """
+    global _parser_pool
+    if pool is None:
+        pool = _parser_pool
+    if pool is None:
+        return
+    # Only forget the global if it is still this pool; it may already have been replaced
+    if _parser_pool is pool:
+        _parser_pool = None
+    if kill:
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+async def _read_upload(file: UploadFile) -> bytes:
+    if file.size is not None and file.size > RAG_MAX_FILE_BYTES:
+        raise HTTPException(status_code=413, detail=f"File is larger than the {RAG_MAX_FILE_BYTES} byte limit.")
+    data = await file.read()
+    if len(data) > RAG_MAX_FILE_BYTES:
+        raise HTTPException(status_code=413, detail=f"File is larger than the {RAG_MAX_FILE_BYTES} byte limit.")
+    return data
+
+async def parse_document(parser, file: UploadFile):
+    data = await _read_upload(file)
+    loop = asyncio.get_running_loop()
+    async with _parse_slots:
+        pool = _get_parser_pool()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(pool, run_with_timeout, parser, data, RAG_PARSE_TIMEOUT),
+                timeout=RAG_PARSE_TIMEOUT + RAG_PARSE_KILL_GRACE
+            )
+        except ParseTimeoutError:
+            logger.error(f"Parsing {file.filename} exceeded {RAG_PARSE_TIMEOUT}s")
+            raise HTTPException(status_code=408, detail=f"Parsing the file took longer than {RAG_PARSE_TIMEOUT} seconds.")
+        except asyncio.TimeoutError:
+            logger.error(f"Parsing {file.filename} did not stop after {RAG_PARSE_TIMEOUT}s, restarting the parser pool")
+            # The worker did not interrupt itself; the only way left to stop it is to kill its process
+            shutdown_parser_pool(pool, kill=True)
+            raise HTTPException(status_code=408, detail=f"Parsing the file took longer than {RAG_PARSE_TIMEOUT} seconds.")
+        except BrokenProcessPool:
+            shutdown_parser_pool(pool)
+            raise
+
 async def extract_pdf_text(file: UploadFile) -> str:
-    pdf_reader = PyPDF2.PdfReader(io.BytesIO(await file.read()))
-    text = ""
-    for page in pdf_reader.pages:
-        text += page.extract_text()
-    return text
+    return await parse_document(parse_pdf, file)
 
 # Function to extract text from DOCX file
 async def extract_docx_text(file: UploadFile) -> str:
-    doc = docx.Document(io.BytesIO(await file.read()))
-    text = ""
-    for para in doc.paragraphs:
-        text += para.text + "\n"
-    return text
+    return await parse_document(parse_docx, file)
 
 # Function to extract text from CSV file
 async def extract_csv_text(file: UploadFile) -> str:
-    df = pd.read_csv(io.BytesIO(await file.read()))
-    def row_to_string(row):
-        return ', '.join([f"{col}: {value}" for col, value in row.items()])
-
-    data = df.apply(row_to_string, axis=1).tolist()
-    return data
+    return await parse_document(parse_csv, file)
 
 async def get_csv_query_type(doc_data, query):
     content = doc_data.get('content', {})
@@ -0,0 +1,42 @@
+import asyncio
+import copy
+from cachetools import TTLCache
+
+class SingleFlight:
+    """
+    Coalesce concurrent loads of the same key into one in-flight call.
+
+    The caller that started the load gets the loaded object itself; callers that
+    joined it get their own deep copy, taken from a snapshot so the first caller
+    is free to mutate its result. With stale_ttl set, the last successful value of
+    a key is kept and handed out to callers that arrive while a reload of that key
+    is already in flight (stale-while-revalidate) instead of making them wait.
+    """
+    def __init__(self, stale_ttl=0, stale_maxsize=1000):
+        self.in_flight = {}  # key -> [future, number of callers that joined it]
+        self.stale = TTLCache(maxsize=stale_maxsize, ttl=stale_ttl) if stale_ttl else None
+
+    async def run(self, key, loader):
+        flight = self.in_flight.get(key)
+        if flight is None:
+            flight = self.in_flight[key] = [None, 0]
+            flight[0] = asyncio.ensure_future(self._load(key, loader, flight))
+            # Shield the shared load so one cancelled caller does not cancel it for the rest
+            result, _ = await asyncio.shield(flight[0])
+            return result
+        if self.stale is not None and key in self.stale:
+            return copy.deepcopy(self.stale[key])
+        flight[1] += 1
+        _, snapshot = await asyncio.shield(flight[0])
+        return copy.deepcopy(snapshot)
+
+    async def _load(self, key, loader, flight):
+        try:
+            result = await loader()
+        finally:
+            self.in_flight.pop(key, None)
+        # Nobody can join once the key is popped, so a lone load is never copied
+        snapshot = copy.deepcopy(result) if flight[1] or self.stale is not None else None
+        if self.stale is not None:
+            self.stale[key] = snapshot
+        return result, snapshot
@@ -14,6 +14,8 @@ class TokenCalculator:
             "cache_creation_input_tokens":0,
             "reasoning_tokens": 0
         }
+        # Cost of calls priced separately (e.g. the losing attempt of a hedged request)
+        self.external_cost = 0
 
     def calculate_usage(self, model_response):
         usage = {}
@@ -137,10 +139,14 @@ class TokenCalculator:
             cost["cached_cost"] + 
             cost["reasoning_cost"] + 
             cost["cache_read_cost"] + 
-            cost["cache_creation_cost"]
+            cost["cache_creation_cost"] +
+            self.external_cost
         )
         
         return cost
 
+    def add_external_cost(self, amount):
+        self.external_cost += amount or 0
+
     def get_total_usage(self):
         return self.total_usage
@@ -1,10 +1,74 @@
 import logging
 import json
-from ..cache_service import store_in_cache, find_in_cache, delete_in_cache
+from ..cache_service import store_many_in_cache, find_in_cache, delete_in_cache, client, REDIS_PREFIX, DEFAULT_REDIS_TTL
 from src.configs.constant import redis_keys, limit_types
 from datetime import datetime
 logger = logging.getLogger(__name__)
 
+# Read-modify-write of a usage document in one step, so concurrent requests on the
+# same bridge/folder/apikey cannot overwrite each other's increments. The stored
+# value keeps its JSON shape {usage_value, versions[, bridges]}.
+# KEYS[1] usage key
+# ARGV[1] cost increment, ARGV[2] usage to seed with when the key is missing,
+# ARGV[3] version_id and ARGV[4] bridge_id to record ('' to skip),
+# ARGV[5] '1' to keep a bridges list, ARGV[6] ttl in seconds
+USAGE_COST_LUA = """
+local function add_item(list, item)
+    if type(list) ~= 'table' then list = {} end
+    if item == '' then return list end
+    for _, value in ipairs(list) do
+        if value == item then return list end
+    end
+    table.insert(list, item)
+    return list
+end
+
+local function encode_list(list)
+    if #list == 0 then return '[]' end
+    return cjson.encode(list)
+end
+
+local data = nil
+local raw = redis.call('GET', KEYS[1])
+if raw then
+    local ok, decoded = pcall(cjson.decode, raw)
+    if ok and type(decoded) == 'table' then data = decoded end
+end
+if not data then
+    data = {usage_value = tonumber(ARGV[2]) or 0}
+end
+
+local usage = (tonumber(data['usage_value']) or 0) + tonumber(ARGV[1])
+local parts = {
+    '"usage_value": ' .. string.format('%.15g', usage),
+    '"versions": ' .. encode_list(add_item(data['versions'], ARGV[3]))
+}
+if ARGV[5] == '1' then
+    table.insert(parts, '"bridges": ' .. encode_list(add_item(data['bridges'], ARGV[4])))
+end
+redis.call('SET', KEYS[1], '{' .. table.concat(parts, ', ') .. '}', 'EX', tonumber(ARGV[6]))
+return string.format('%.15g', usage)
+"""
+usage_cost_script = client.register_script(USAGE_COST_LUA)
+
+
+async def _apply_usage(cache_key, limit_type, cost_increment=0.0, seed_usage=0.0, version_id=None, bridge_id=None):
+    """Atomically add cost_increment to a usage document and return the new usage value."""
+    result = await usage_cost_script(
+        keys=[f"{REDIS_PREFIX}{cache_key}"],
+        args=[
+            float(cost_increment or 0),
+            float(seed_usage or 0),
+            str(version_id) if version_id else '',
+            str(bridge_id) if bridge_id else '',
+            '0' if limit_type == 'bridge' else '1',
+            DEFAULT_REDIS_TTL,
+        ],
+    )
+    if isinstance(result, bytes):
+        result = result.decode('utf-8')
+    return float(result)
+
 def _build_limit_error(limit_type, current_usage, limit_value):
     """Helper to build a standard limit exceeded payload."""
     return {
@@ -47,75 +111,24 @@ async def _check_limit(limit_type, data, version_id):
         apikey_object_id = data.get('apikey_object_id') or {}
         identifier = apikey_object_id.get(service)
     
-    usage_value = 0.0
-    
+    # Usage stored on the bridge document, used to seed the cache when it has no entry yet
+    try:
+        if(limit_type=="apikey"):
+            stored_usage=float(data.get("apikeys", {}).get(data.get("service"), {}).get(usage_field, 0) or 0) or float(data.get("folder_apikeys", {}).get(data.get("service"), {}).get(usage_field, 0) or 0)
+        else:
+            stored_usage = float(data.get(usage_field, 0) or 0) or float(data.get("bridges",{}).get(usage_field) or 0)
+    except (ValueError, TypeError):
+        stored_usage = 0.0
+
+    usage_value = stored_usage
+
     if identifier:
-        # Try to get usage from Redis first bridgeusage_
+        # Read usage from Redis (seeding it if missing) and record this version/bridge in one atomic call
         cache_key = f"{redis_keys[f'{limit_type}usedcost_']}{identifier}"
         try:
-            cached_data = await find_in_cache(cache_key)
-            if cached_data:
-                currentusagedata=json.loads(cached_data)
-                usage_value = float(currentusagedata.get("usage_value", 0))
-                
-                # Add version_id to versions array if not already present
-                versions = currentusagedata.get("versions", [])
-                bridges = currentusagedata.get("bridges", [])
-                
-                if version_id and version_id not in versions:
-                    versions.append(version_id)
-
-                if bridge_id and bridge_id not in bridges:
-                    bridges.append(bridge_id)
-                    
-                    # Different data structure based on limit_type
-                    if limit_type == 'bridge':
-                        updated_data = {
-                            "usage_value": usage_value,
-                            "versions": versions
-                        }
-                    else :
-                        updated_data = {
-                            "usage_value": usage_value,
-                            "versions": versions,
-                            "bridges": bridges
-                        }
-                    
-                    await store_in_cache(cache_key,updated_data)
-            else:
-                # If data is not available in Redis, get it from bridge data
-                try:
-                    if(limit_type=="apikey"):
-                       usage_value=float(data.get("apikeys", {}).get(data.get("service"), {}).get(usage_field, 0) or 0) or float(data.get("folder_apikeys", {}).get(data.get("service"), {}).get(usage_field, 0) or 0)
-                    else:
-                       usage_value = float(data.get(usage_field, 0) or 0) or float(data.get("bridges",{}).get(usage_field) or 0)
-                except (ValueError, TypeError):
-                    usage_value = 0.0
-                
-                # Store in Redis with new data structure based on limit_type
-                if limit_type == 'bridge':
-                    usage_data = {
-                        "usage_value": usage_value,
-                        "versions": [version_id]
-                    }
-                else:
-                    usage_data = {
-                        "usage_value": usage_value,
-                        "versions": [version_id],
-                        "bridges": [bridge_id]
-                    }
-                await store_in_cache(cache_key, usage_data)
-                
+            usage_value = await _apply_usage(cache_key, limit_type, seed_usage=stored_usage, version_id=version_id, bridge_id=bridge_id)
         except Exception as e:
-            usage_value = 0.0
-               
-    else:
-        try:
-            if(limit_type=="apikey"):
-                       usage_value=float(data.get("apikeys", {}).get(data.get("service"), {}).get(usage_field, 0) or 0) or float(data.get("folder_apikeys", {}).get(data.get("service"), {}).get(usage_field, 0) or 0)
-            else:
-                       usage_value = float(data.get(usage_field, 0) or 0) or float(data.get("bridges",{}).get(usage_field) or 0)
-        except (ValueError, TypeError):
+            logger.error(f"Error reading usage cost for key {cache_key}: {str(e)}")
             usage_value = 0.0
 
     if usage_value >= limit_value:
@@ -191,10 +204,11 @@ async def purge_related_bridge_caches(bridge_id: str, bridge_usage: int = -1):
         keys_to_delete.append(f"{redis_keys['bridge_data_with_tools_']}{bridge_id}")
         keys_to_delete.append(f"{redis_keys['get_bridge_data_']}{bridge_id}")
 
-        if keys_to_delete:
-            await delete_in_cache(keys_to_delete)
         if bridge_usage == 0:
-          await delete_in_cache(usage_cache_key)
+            keys_to_delete.append(usage_cache_key)
+
+        # One DEL and one invalidation publish for every related key
+        await delete_in_cache(keys_to_delete)
     except Exception as e:
         logger.error(f"Failed purging related bridge caches: {str(e)}")
 
@@ -204,23 +218,7 @@ async def purge_related_bridge_caches(bridge_id: str, bridge_usage: int = -1):
 
 async def update_usage_cost_in_cache(cache_key, cost_increment,limit_type):
     try:
-        cache_data = await find_in_cache(cache_key)
-        if cache_data:
-            currentusagedata=json.loads(cache_data)
-            try:
-                usage_value = float(currentusagedata.get("usage_value", 0)) if currentusagedata else 0.0
-            except (json.JSONDecodeError, TypeError, ValueError):
-                usage_value = 0.0
-        else:
-            currentusagedata = None
-            usage_value = 0.0
-        new_usage = usage_value + cost_increment
-
-        if limit_type == 'bridge':
-            await store_in_cache(cache_key, {"usage_value": new_usage, "versions": currentusagedata.get("versions", []) if currentusagedata else []})
-        else:
-            await store_in_cache(cache_key, {"usage_value": new_usage, "versions": currentusagedata.get("versions", []) if currentusagedata else [], "bridges": currentusagedata.get("bridges", []) if currentusagedata else []})
-        
+        await _apply_usage(cache_key, limit_type, cost_increment=cost_increment)
     except Exception as e:
         logger.error(f"Error updating usage cost for key {cache_key}: {str(e)}")
 
@@ -259,14 +257,16 @@ async def update_last_used(parsed_data):
          apikey_id = (parsed_data.get('apikey_object_id') or {}).get(service)
 
          bridge_id = parsed_data.get('bridge_id')
-        
+         now = datetime.now()
+         last_used = {}
+
          if bridge_id:
-            bridge_usage_key = f"{redis_keys['bridgelastused_']}{bridge_id}"
-            await store_in_cache(bridge_usage_key, datetime.now())
+            last_used[f"{redis_keys['bridgelastused_']}{bridge_id}"] = now
 
          if apikey_id:
-            api_usage_key = f"{redis_keys['apikeylastused_']}{apikey_id}"
-            await store_in_cache(api_usage_key, datetime.now())
+            last_used[f"{redis_keys['apikeylastused_']}{apikey_id}"] = now
+
+         await store_many_in_cache(last_used)
 
     except Exception as e:
         logger.error(f"Error updating last used cache: {str(e)}")
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from src.services import cache_service
+from src.services.cache_service import REDIS_PREFIX, find_many_in_cache, find_many_json_in_cache, find_json_in_cache
+
+
+@pytest.mark.asyncio
+async def test_find_many_in_cache_is_one_round_trip(fake_redis):
+    await fake_redis.set(f"{REDIS_PREFIX}a", json.dumps({'a': 1}))
+    await fake_redis.set(f"{REDIS_PREFIX}c", json.dumps([3]))
+    fake_redis.commands.clear()
+
+    values = await find_many_in_cache(['a', 'b', 'c'])
+
+    assert values == [json.dumps({'a': 1}), None, json.dumps([3])]
+    assert fake_redis.commands == ['MGET']
+
+
+@pytest.mark.asyncio
+async def test_find_many_json_in_cache_serves_l1_hits_locally(fake_redis):
+    await fake_redis.set(f"{REDIS_PREFIX}a", json.dumps({'a': 1}))
+    await fake_redis.set(f"{REDIS_PREFIX}b", json.dumps({'b': 2}))
+    assert await find_json_in_cache('a', use_local_cache=True) == {'a': 1}
+    fake_redis.commands.clear()
+
+    values = await find_many_json_in_cache(['a', 'b', 'missing'], use_local_cache=True)
+
+    assert values == [{'a': 1}, {'b': 2}, None]
+    # Only the keys that were not in L1 go to Redis, together
+    assert fake_redis.commands == ['MGET']
+    assert 'b' in cache_service.local_cache and 'missing' not in cache_service.local_cache
+
+    values[1]['b'] = 'changed'
+    fake_redis.commands.clear()
+    assert await find_json_in_cache('b', use_local_cache=True) == {'b': 2}
+    assert fake_redis.commands == []
+
+
+@pytest.mark.asyncio
+async def test_versioned_bridge_lookup_reads_redis_once(fake_redis):
+    from src.configs.constant import redis_keys
+    from src.services.utils.getConfiguration_utils import get_bridge_data
+
+    bridge = {'success': True, 'bridges': {'_id': 'bridge1', 'parent_id': 'bridge1'}}
+    await fake_redis.set(f"{REDIS_PREFIX}{redis_keys['bridge_data_with_tools_']}version1", json.dumps(bridge))
+    await fake_redis.set(f"{REDIS_PREFIX}{redis_keys['get_bridge_data_']}bridge1", json.dumps([{'_id': 'bridge1', 'bridge_status': 1}]))
+    fake_redis.commands.clear()
+
+    result, bridge_data, bridge_id = await get_bridge_data('bridge1', 'org1', 'version1')
+
+    assert result == bridge
+    assert bridge_data == {'_id': 'bridge1', 'bridge_status': 1}
+    assert bridge_id == 'bridge1'
+    assert fake_redis.commands == ['MGET']
@@ -0,0 +1,143 @@
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from bson import ObjectId
+
+from src.configs import model_configuration
+from src.configs.model_configuration import (
+    apply_model_configuration_change,
+    init_model_configuration,
+    model_config_document,
+)
+
+GPT_ID, CLAUDE_ID = ObjectId(), ObjectId()
+
+
+def _document(_id, service, model_name, **extra):
+    return {'_id': _id, 'service': service, 'model_name': model_name, **extra}
+
+
+@pytest_asyncio.fixture
+async def loaded(monkeypatch):
+    documents = AsyncMock(return_value=[
+        _document(GPT_ID, 'openai', 'gpt-4o', max_tokens=4096),
+        _document(CLAUDE_ID, 'anthropic', 'claude-sonnet', max_tokens=8192),
+    ])
+    monkeypatch.setattr(model_configuration, 'get_model_configuration_documents', documents)
+    await init_model_configuration()
+    return documents
+
+
+@pytest.mark.asyncio
+async def test_init_publishes_a_complete_read_only_snapshot(loaded):
+    assert model_config_document['openai']['gpt-4o'] == {'service': 'openai', 'model_name': 'gpt-4o', 'max_tokens': 4096}
+    assert set(model_config_document) == {'openai', 'anthropic'}
+    with pytest.raises(TypeError):
+        model_config_document['openai']['gpt-4o-mini'] = {}
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_the_snapshot_without_touching_the_old_one(loaded):
+    before = model_config_document.snapshot()
+    loaded.return_value = [_document(GPT_ID, 'openai', 'gpt-4o', max_tokens=16384)]
+    await init_model_configuration()
+
+    assert model_config_document['openai']['gpt-4o']['max_tokens'] == 16384
+    assert 'anthropic' not in model_config_document
+    assert before['openai']['gpt-4o']['max_tokens'] == 4096
+    assert 'anthropic' in before
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_keeps_the_previous_snapshot(loaded):
+    before = model_config_document.snapshot()
+    loaded.side_effect = RuntimeError('mongo down')
+    await init_model_configuration()
+
+    assert model_config_document.snapshot() is before
+
+
+@pytest.mark.asyncio
+async def test_update_patches_only_the_changed_model(loaded):
+    before = model_config_document.snapshot()
+    apply_model_configuration_change({
+        'operationType': 'update',
+        'documentKey': {'_id': GPT_ID},
+        'fullDocument': _document(GPT_ID, 'openai', 'gpt-4o', max_tokens=32768),
+    })
+
+    assert model_config_document['openai']['gpt-4o']['max_tokens'] == 32768
+    assert model_config_document['anthropic'] is before['anthropic']
+    assert before['openai']['gpt-4o']['max_tokens'] == 4096
+
+
+@pytest.mark.asyncio
+async def test_insert_rename_and_delete(loaded):
+    new_id = ObjectId()
+    apply_model_configuration_change({
+        'operationType': 'insert',
+        'documentKey': {'_id': new_id},
+        'fullDocument': _document(new_id, 'groq', 'llama-3'),
+    })
+    assert model_config_document['groq']['llama-3']['model_name'] == 'llama-3'
+
+    # A replace that renames the model drops the old name
+    apply_model_configuration_change({
+        'operationType': 'replace',
+        'documentKey': {'_id': GPT_ID},
+        'fullDocument': _document(GPT_ID, 'openai', 'gpt-4.1'),
+    })
+    assert set(model_config_document['openai']) == {'gpt-4.1'}
+
+    # Deleting the last model of a service removes the service
+    apply_model_configuration_change({'operationType': 'delete', 'documentKey': {'_id': new_id}})
+    assert 'groq' not in model_config_document
+    assert set(model_config_document) == {'openai', 'anthropic'}
+
+
+class FakeChangeStream:
+    def __init__(self, changes):
+        self.changes = changes
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for change in self.changes:
+            yield change
+
+
+@pytest.mark.asyncio
+async def test_listener_reloads_on_open_and_applies_events(loaded, monkeypatch):
+    changes = [
+        {
+            'operationType': 'update',
+            'documentKey': {'_id': CLAUDE_ID},
+            'fullDocument': _document(CLAUDE_ID, 'anthropic', 'claude-sonnet', max_tokens=64000),
+        },
+        # Cannot be applied on its own, so the listener falls back to a full reload
+        {'operationType': 'update', 'documentKey': {'_id': GPT_ID}, 'fullDocument': {'model_name': 'no-service'}},
+    ]
+    watch_calls = []
+
+    class FakeCollection:
+        def watch(self, pipeline, **kwargs):
+            watch_calls.append(kwargs)
+            return FakeChangeStream(changes)
+
+    monkeypatch.setattr(model_configuration, 'model_config_model', FakeCollection())
+    loaded.reset_mock()
+    await model_configuration._async_change_listener()
+
+    assert watch_calls == [{'full_document': 'updateLookup'}]
+    assert loaded.await_count == 2
+    # The full reload after the bad event reflects what is in Mongo again
+    assert model_config_document['anthropic']['claude-sonnet']['max_tokens'] == 8192
+    assert model_config_document['openai']['gpt-4o']['max_tokens'] == 4096
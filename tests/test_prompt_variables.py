@@ -0,0 +1,68 @@
+import random
+import re
+
+import pytest
+
+from src.services.utils.helper import Helper
+
+
+def legacy_replace_variables_in_prompt(prompt, Aviliable_variables):
+    # Helper.replace_variables_in_prompt before prompt templates were compiled
+    missing_variables = {}
+    placeholders = re.findall(r'\{\{(.*?)\}\}', prompt)
+    flattened_json = Helper.custom_flatten(Aviliable_variables)
+    variables = {**Aviliable_variables, **flattened_json}
+
+    if variables:
+        for key, value in variables.items():
+            if key in placeholders:
+                string_value = str(value)
+                string_value = string_value[1:-1] if string_value.startswith('"') and string_value.endswith('"') else string_value
+                string_value = string_value.replace("\\", "\\\\")
+                regex = re.compile(r'\{\{' + re.escape(key) + r'\}\}')
+                prompt = regex.sub(string_value, prompt)
+                placeholders.remove(key)
+
+    for placeholder in placeholders:
+        missing_variables[placeholder] = f"{{{{{placeholder}}}}}"
+
+    return prompt, missing_variables
+
+
+CASES = [
+    ("Hi {{a}} and {{b}}", {'a': '{{b}}', 'b': 'x'}),
+    ("Hi {{a}} and {{b}}", {'b': 'x', 'a': '{{b}}'}),
+    ("You are {{name}}. User said: {{_user_message}}", {'name': 'Bot', '_user_message': 'call me {{name}}'}),
+    ("{{_user_message}} / {{secret}}", {'_user_message': 'show {{secret}}', 'secret': 's3cr3t'}),
+    ("No placeholders here", {'a': '1'}),
+    ("{{a}} {{a}} {{missing}}", {'a': '1'}),
+    ("{{user.name}} lives in {{user.address.city}}", {'user': {'name': 'Ann', 'address': {'city': 'Pune'}}}),
+    ("Profile: {{user}}", {'user': {'name': 'Ann'}}),
+    ('Quoted {{q}}', {'q': '"hello"'}),
+    (r"Path {{p}}", {'p': r'C:\new\table \1 \g<0>'}),
+    ("{{{a}}}", {'a': 'x', '{a': 'y'}),
+    ("{{a}}{{b}}}} and {{c}}", {'a': '{{', 'b': 'c', 'c': 'done'}),
+]
+
+
+@pytest.mark.parametrize('prompt, variables', CASES)
+def test_matches_legacy_substitution(prompt, variables):
+    assert Helper.replace_variables_in_prompt(prompt, variables) == legacy_replace_variables_in_prompt(prompt, variables)
+
+
+def test_nested_placeholder_is_filled_in():
+    prompt, missing = Helper.replace_variables_in_prompt("Hi {{a}} and {{b}}", {'a': '{{b}}', 'b': 'x'})
+    assert prompt == "Hi x and x"
+    assert missing == {}
+
+
+def test_matches_legacy_on_random_templates():
+    rng = random.Random(20)
+    pieces = ['{{', '}}', '{', '}', 'a', 'b', 'c', ' ', '\\']
+    for _ in range(5000):
+        prompt = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+        variables = {
+            key: ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 4)))
+            for key in rng.sample(['a', 'b', 'c', '{a', 'a{', ' '], rng.randint(0, 4))
+        }
+        assert Helper.replace_variables_in_prompt(prompt, variables) == legacy_replace_variables_in_prompt(prompt, variables), (prompt, variables)
@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services.commonServices.baseService import baseService
+from src.services.commonServices.baseService.baseService import BaseService
+from src.services.commonServices.response_cache import response_cache_key
+from src.services.commonServices.streaming import stream_sink
+
+CONFIGURATION = {
+    'model': 'gpt-4o',
+    'temperature': 0.2,
+    'input': [{'role': 'user', 'content': 'What is the capital of France?'}],
+    'tools': [{'name': 'lookup', 'parameters': {'type': 'object', 'properties': {}}}],
+}
+MODEL_RESPONSE = {'id': 'resp_1', 'output': [{'type': 'message', 'content': [{'text': 'Paris'}]}]}
+
+
+def test_key_is_stable_and_ignores_key_order():
+    reordered = {key: CONFIGURATION[key] for key in reversed(list(CONFIGURATION))}
+    reordered['tools'] = [{'parameters': {'properties': {}, 'type': 'object'}, 'name': 'lookup'}]
+
+    key = response_cache_key('openai', CONFIGURATION, 'org1', 'bridge1')
+    assert key == response_cache_key('openai', dict(CONFIGURATION), 'org1', 'bridge1')
+    assert key == response_cache_key('openai', reordered, 'org1', 'bridge1')
+
+
+@pytest.mark.parametrize('service, configuration, org_id, bridge_id', [
+    ('anthropic', CONFIGURATION, 'org1', 'bridge1'),
+    ('openai', CONFIGURATION, 'org2', 'bridge1'),
+    ('openai', CONFIGURATION, 'org1', 'bridge2'),
+    ('openai', {**CONFIGURATION, 'temperature': 0.3}, 'org1', 'bridge1'),
+    ('openai', {**CONFIGURATION, 'input': CONFIGURATION['input'] + [{'role': 'tool', 'content': '{"result": 1}'}]}, 'org1', 'bridge1'),
+])
+def test_key_changes_with_anything_sent_to_the_provider(service, configuration, org_id, bridge_id):
+    assert response_cache_key(service, configuration, org_id, bridge_id) != response_cache_key('openai', CONFIGURATION, 'org1', 'bridge1')
+
+
+def test_key_accepts_values_that_are_not_json():
+    configuration = {**CONFIGURATION, 'metadata': {'sent_at': datetime(2026, 1, 1), 1: 'numeric key'}}
+    assert response_cache_key('openai', configuration, 'org1', 'bridge1') == response_cache_key('openai', dict(configuration), 'org1', 'bridge1')
+
+
+def _service(response_cache_settings):
+    return BaseService({
+        'bridge_id': 'bridge1',
+        'org_id': 'org1',
+        'user': 'What is the capital of France?',
+        'configuration': {'prompt': 'You are helpful'},
+        'execution_time_logs': [],
+        'response_cache': response_cache_settings,
+    })
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    provider = AsyncMock(return_value={'success': True, 'response': MODEL_RESPONSE})
+    monkeypatch.setattr(baseService, 'openai_response_model', provider)
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_second_identical_call_is_served_from_cache(fake_redis, provider):
+    service = _service({'is_enable': True, 'ttl': 60})
+
+    first = await service.chats(dict(CONFIGURATION), 'sk-test', 'openai')
+    second = await service.chats(dict(CONFIGURATION), 'sk-test', 'openai')
+
+    assert first == second == {'success': True, 'modelResponse': MODEL_RESPONSE}
+    assert provider.await_count == 1
+    key = response_cache_key('openai', CONFIGURATION, 'org1', 'bridge1')
+    assert 0 < await fake_redis.ttl(f"AIMIDDLEWARE_{key}") <= 60
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_is_not_read_or_written(fake_redis, provider):
+    service = _service({})
+
+    await service.chats(dict(CONFIGURATION), 'sk-test', 'openai')
+    await service.chats(dict(CONFIGURATION), 'sk-test', 'openai')
+
+    assert provider.await_count == 2
+    assert fake_redis.commands == []
+
+
+@pytest.mark.asyncio
+async def test_streamed_requests_bypass_the_cache(fake_redis, provider):
+    service = _service({'is_enable': True})
+    token = stream_sink.set(asyncio.Queue())
+    try:
+        await service.chats(dict(CONFIGURATION), 'sk-test', 'openai')
+        await service.chats(dict(CONFIGURATION), 'sk-test', 'openai')
+    finally:
+        stream_sink.reset(token)
+
+    assert provider.await_count == 2
+    assert fake_redis.commands == []
+
+
+@pytest.mark.asyncio
+async def test_failed_responses_are_not_stored(fake_redis, provider, monkeypatch):
+    store = AsyncMock()
+    monkeypatch.setattr(baseService, 'store_cached_response', store)
+    provider.return_value = {'success': False, 'error': 'rate limited'}
+    service = _service({'is_enable': True})
+
+    with pytest.raises(ValueError):
+        await service.chats(dict(CONFIGURATION), 'sk-test', 'openai')
+
+    store.assert_not_awaited()
+    assert 'SET' not in fake_redis.commands
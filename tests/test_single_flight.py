@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from src.services.utils.single_flight import SingleFlight
+
+
+class Loader:
+    """A loader that counts its calls and finishes only when released."""
+
+    def __init__(self, value=None, error=None):
+        self.calls = 0
+        self.value = value
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return {'value': self.value, 'items': [1, 2]}
+
+
+async def _start(flight, key, loader, count):
+    tasks = [asyncio.create_task(flight.run(key, loader)) for _ in range(count)]
+    await asyncio.sleep(0)
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_load():
+    flight = SingleFlight()
+    loader = Loader('v1')
+    tasks = await _start(flight, 'bridge1', loader, 5)
+    loader.release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert loader.calls == 1
+    assert all(result == {'value': 'v1', 'items': [1, 2]} for result in results)
+    assert flight.in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_every_caller_gets_its_own_copy():
+    flight = SingleFlight()
+    loader = Loader('v1')
+    leader, *followers = await _start(flight, 'bridge1', loader, 3)
+    loader.release.set()
+    leader_result = await leader
+    leader_result['items'].append(3)
+    follower_results = await asyncio.gather(*followers)
+
+    assert all(result == {'value': 'v1', 'items': [1, 2]} for result in follower_results)
+    assert follower_results[0] is not follower_results[1]
+    assert follower_results[0]['items'] is not follower_results[1]['items']
+
+
+@pytest.mark.asyncio
+async def test_different_keys_load_separately():
+    flight = SingleFlight()
+    loader = Loader('v1')
+    tasks = await _start(flight, 'bridge1', loader, 2) + await _start(flight, 'bridge2', loader, 2)
+    loader.release.set()
+    await asyncio.gather(*tasks)
+
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_caller_and_is_not_cached():
+    flight = SingleFlight()
+    loader = Loader(error=RuntimeError('mongo down'))
+    tasks = await _start(flight, 'bridge1', loader, 4)
+    loader.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert loader.calls == 1
+    assert all(isinstance(result, RuntimeError) and str(result) == 'mongo down' for result in results)
+    assert flight.in_flight == {}
+
+    retry = Loader('v2')
+    retry.release.set()
+    assert await flight.run('bridge1', retry) == {'value': 'v2', 'items': [1, 2]}
+    assert retry.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+    loader = Loader('v1')
+    leader, follower = await _start(flight, 'bridge1', loader, 2)
+    leader.cancel()
+    await asyncio.sleep(0)
+    loader.release.set()
+
+    assert await follower == {'value': 'v1', 'items': [1, 2]}
+    assert leader.cancelled()
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_reloading():
+    flight = SingleFlight(stale_ttl=60)
+    first = Loader('v1')
+    first.release.set()
+    assert await flight.run('bridge1', first) == {'value': 'v1', 'items': [1, 2]}
+
+    reload = Loader('v2')
+    leader = asyncio.create_task(flight.run('bridge1', reload))
+    await asyncio.sleep(0)
+    # Joins the in-flight reload, but gets the last value straight away
+    stale = await flight.run('bridge1', reload)
+    assert stale == {'value': 'v1', 'items': [1, 2]}
+    stale['items'].append(3)
+
+    reload.release.set()
+    assert await leader == {'value': 'v2', 'items': [1, 2]}
+    assert reload.calls == 1
+    assert flight.stale['bridge1'] == {'value': 'v2', 'items': [1, 2]}
@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+import pytest
+
+from src.configs.constant import redis_keys
+from src.services.cache_service import DEFAULT_REDIS_TTL, REDIS_PREFIX, increment_in_cache
+from src.services.utils import update_and_check_cost
+from src.services.utils.update_and_check_cost import USAGE_COST_LUA, check_bridge_api_folder_limits, update_usage_cost_in_cache
+
+CONCURRENT_REQUESTS = 50
+
+
+@pytest.fixture
+def usage_script(fake_redis, monkeypatch):
+    # The script is registered on the real client at import time
+    monkeypatch.setattr(update_and_check_cost, 'usage_cost_script', fake_redis.register_script(USAGE_COST_LUA))
+    return fake_redis
+
+
+async def _usage_document(redis, cache_key):
+    return json.loads(await redis.get(f"{REDIS_PREFIX}{cache_key}"))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_cost_updates_are_not_lost(usage_script):
+    cache_key = f"{redis_keys['bridgeusedcost_']}bridge1"
+    await usage_script.set(f"{REDIS_PREFIX}{cache_key}", json.dumps({'usage_value': 1.5, 'versions': ['version1']}))
+
+    await asyncio.gather(*(update_usage_cost_in_cache(cache_key, 0.25, 'bridge') for _ in range(CONCURRENT_REQUESTS)))
+
+    document = await _usage_document(usage_script, cache_key)
+    assert document == {'usage_value': 1.5 + 0.25 * CONCURRENT_REQUESTS, 'versions': ['version1']}
+    assert 0 < await usage_script.ttl(f"{REDIS_PREFIX}{cache_key}") <= DEFAULT_REDIS_TTL
+
+
+@pytest.mark.asyncio
+async def test_concurrent_limit_checks_seed_once_and_record_every_version(usage_script):
+    result = {'folder_id': 'folder1', 'folder_limit': 100, 'folder_usage': 10, 'bridges': {'_id': 'bridge1'}}
+    bridge_data = {'_id': 'bridge1'}
+
+    errors = await asyncio.gather(*(
+        check_bridge_api_folder_limits(result, bridge_data, f"version{index % 3}")
+        for index in range(CONCURRENT_REQUESTS)
+    ))
+    await asyncio.gather(*(
+        update_usage_cost_in_cache(f"{redis_keys['folderusedcost_']}folder1", 0.5, 'folder')
+        for _ in range(CONCURRENT_REQUESTS)
+    ))
+
+    assert errors == [None] * CONCURRENT_REQUESTS
+    document = await _usage_document(usage_script, f"{redis_keys['folderusedcost_']}folder1")
+    # Seeded from the stored folder usage exactly once, then every increment applied
+    assert document['usage_value'] == 10 + 0.5 * CONCURRENT_REQUESTS
+    assert sorted(document['versions']) == ['version0', 'version1', 'version2']
+    assert document['bridges'] == ['bridge1']
+
+
+@pytest.mark.asyncio
+async def test_limit_is_reported_from_the_shared_total(usage_script):
+    cache_key = f"{redis_keys['bridgeusedcost_']}bridge1"
+    await asyncio.gather(*(update_usage_cost_in_cache(cache_key, 1, 'bridge') for _ in range(CONCURRENT_REQUESTS)))
+
+    error = await check_bridge_api_folder_limits({}, {'_id': 'bridge1', 'bridge_limit': CONCURRENT_REQUESTS}, None)
+
+    assert error['error_code'] == 'BRIDGE_LIMIT_EXCEEDED'
+    assert error['current_usage'] == CONCURRENT_REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_concurrent_token_increments_are_not_lost(fake_redis):
+    totals = await asyncio.gather(*(increment_in_cache('metrix_bridges_bridge1', 10) for _ in range(CONCURRENT_REQUESTS)))
+
+    assert max(totals) == 10 * CONCURRENT_REQUESTS
+    assert float(await fake_redis.get(f"{REDIS_PREFIX}metrix_bridges_bridge1")) == 10 * CONCURRENT_REQUESTS